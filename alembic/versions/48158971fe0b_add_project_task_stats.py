@@ -0,0 +1,59 @@
+"""add project_task_stats
+
+Revision ID: 48158971fe0b
+Revises: 9868f060cedf
+Create Date: 2026-10-18 14:41:09.662318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '48158971fe0b'
+down_revision: Union[str, Sequence[str], None] = '9868f060cedf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_task_stats',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('todo', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('in_progress', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('done', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('unassigned', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('assignment_pending', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('assignment_accepted', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('assignment_rejected', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    # Backfill from the existing tasks
+    op.execute("""
+        INSERT INTO project_task_stats (project_id, total, todo, in_progress, done, unassigned,
+                                        assignment_pending, assignment_accepted, assignment_rejected)
+        SELECT p.id,
+               count(t.id),
+               count(t.id) FILTER (WHERE t.status = 'TODO' OR t.status IS NULL),
+               count(t.id) FILTER (WHERE t.status = 'IN_PROGRESS'),
+               count(t.id) FILTER (WHERE t.status = 'DONE'),
+               count(t.id) FILTER (WHERE t.assignment_status IS NULL),
+               count(t.id) FILTER (WHERE t.assignment_status = 'PENDING'),
+               count(t.id) FILTER (WHERE t.assignment_status = 'ACCEPTED'),
+               count(t.id) FILTER (WHERE t.assignment_status = 'REJECTED')
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_task_stats')
@@ -0,0 +1,61 @@
+"""add indexes for hot query paths
+
+Revision ID: 7fa2674b67f3
+Revises: 6a2f630316f4
+Create Date: 2026-10-18 09:12:40.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7fa2674b67f3'
+down_revision: Union[str, Sequence[str], None] = '6a2f630316f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Activity feed: filtered by task, newest first
+    op.create_index('ix_task_activities_task_id_created_at', 'task_activities', ['task_id', 'created_at'], unique=False)
+
+    # Task lookups by project, assignee and status
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'], unique=False)
+    op.create_index('ix_tasks_assignee_id_status', 'tasks', ['assignee_id', 'status'], unique=False)
+
+    # Membership tables: drop duplicate rows before enforcing one row per pair
+    op.execute(
+        "DELETE FROM project_students a USING project_students b "
+        "WHERE a.project_id = b.project_id AND a.student_id = b.student_id AND a.id > b.id"
+    )
+    op.execute(
+        "DELETE FROM project_supervisors a USING project_supervisors b "
+        "WHERE a.project_id = b.project_id AND a.supervisor_id = b.supervisor_id AND a.id > b.id"
+    )
+    op.create_index('uq_project_students_project_id_student_id', 'project_students', ['project_id', 'student_id'], unique=True)
+    op.create_index('ix_project_students_student_id', 'project_students', ['student_id'], unique=False)
+    op.create_index('uq_project_supervisors_project_id_supervisor_id', 'project_supervisors', ['project_id', 'supervisor_id'], unique=True)
+    op.create_index('ix_project_supervisors_supervisor_id', 'project_supervisors', ['supervisor_id'], unique=False)
+
+    # Per-project history reads
+    op.create_index('ix_ai_generations_project_id_created_at', 'ai_generations', ['project_id', 'created_at'], unique=False)
+    op.create_index('ix_deployments_project_id_deployed_at', 'deployments', ['project_id', 'deployed_at'], unique=False)
+    op.create_index('ix_project_feedback_project_id_created_at', 'project_feedback', ['project_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_feedback_project_id_created_at', table_name='project_feedback')
+    op.drop_index('ix_deployments_project_id_deployed_at', table_name='deployments')
+    op.drop_index('ix_ai_generations_project_id_created_at', table_name='ai_generations')
+    op.drop_index('ix_project_supervisors_supervisor_id', table_name='project_supervisors')
+    op.drop_index('uq_project_supervisors_project_id_supervisor_id', table_name='project_supervisors')
+    op.drop_index('ix_project_students_student_id', table_name='project_students')
+    op.drop_index('uq_project_students_project_id_student_id', table_name='project_students')
+    op.drop_index('ix_tasks_assignee_id_status', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    op.drop_index('ix_task_activities_task_id_created_at', table_name='task_activities')
@@ -0,0 +1,44 @@
+"""add task listing indexes
+
+Revision ID: 9151afaff2f1
+Revises: 7fa2674b67f3
+Create Date: 2026-10-18 11:02:17.904611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9151afaff2f1'
+down_revision: Union[str, Sequence[str], None] = '7fa2674b67f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Board listing pages through a project by id; the INCLUDE columns are the
+    # default field set so unfiltered pages are index-only scans.
+    op.create_index(
+        'ix_tasks_project_id_id', 'tasks', ['project_id', 'id'], unique=False,
+        postgresql_include=['title', 'status', 'assignee_id', 'assignment_status', 'working_user_id']
+    )
+    # Filtered listings: equality on the filter column, then keyset on id
+    op.drop_index('ix_tasks_project_id_status', table_name='tasks')
+    op.create_index('ix_tasks_project_id_status_id', 'tasks', ['project_id', 'status', 'id'], unique=False)
+    op.create_index('ix_tasks_project_id_assignee_id_id', 'tasks', ['project_id', 'assignee_id', 'id'], unique=False)
+    op.create_index('ix_tasks_project_id_assignment_status_id', 'tasks', ['project_id', 'assignment_status', 'id'], unique=False)
+    op.create_index('ix_tasks_project_id_working_user_id_id', 'tasks', ['project_id', 'working_user_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_project_id_working_user_id_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_assignment_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_assignee_id_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_id_status_id', table_name='tasks')
+    op.create_index('ix_tasks_project_id_status', 'tasks', ['project_id', 'status'], unique=False)
+    op.drop_index('ix_tasks_project_id_id', table_name='tasks')
@@ -0,0 +1,100 @@
+"""partition task_activities by month
+
+Revision ID: 9868f060cedf
+Revises: 9151afaff2f1
+Create Date: 2026-10-18 13:26:51.377042
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9868f060cedf'
+down_revision: Union[str, Sequence[str], None] = '9151afaff2f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Months created ahead of the current one; app/scripts/maintain_partitions.py keeps this up
+PARTITIONS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+
+    op.execute("ALTER TABLE task_activities RENAME TO task_activities_legacy")
+    op.execute("ALTER TABLE task_activities_legacy RENAME CONSTRAINT task_activities_pkey TO task_activities_legacy_pkey")
+    op.execute("ALTER INDEX ix_task_activities_id RENAME TO ix_task_activities_legacy_id")
+    op.execute("ALTER INDEX ix_task_activities_task_id_created_at RENAME TO ix_task_activities_legacy_task_id_created_at")
+
+    # The partition key has to be part of the primary key
+    op.execute("""
+        CREATE TABLE task_activities (
+            id INTEGER NOT NULL DEFAULT nextval('task_activities_id_seq'),
+            task_id INTEGER NOT NULL REFERENCES tasks (id),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR(50) NOT NULL,
+            details TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+            CONSTRAINT task_activities_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE task_activities_id_seq OWNED BY task_activities.id")
+    op.create_index('ix_task_activities_id', 'task_activities', ['id'], unique=False)
+    op.create_index('ix_task_activities_task_id_created_at', 'task_activities', ['task_id', 'created_at'], unique=False)
+
+    # No default partition: it would stop the planner from reading partitions
+    # in order, which is what lets newest-first feeds stop at the hot ones.
+    current = date.today().replace(day=1)
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM task_activities_legacy")).scalar()
+    month = min(oldest.date().replace(day=1), current) if oldest else current
+    while month <= _add_months(current, PARTITIONS_AHEAD):
+        op.execute(
+            f"CREATE TABLE task_activities_y{month.year}m{month.month:02d} PARTITION OF task_activities "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute("""
+        INSERT INTO task_activities (id, task_id, user_id, action, details, created_at)
+        SELECT id, task_id, user_id, action, details, COALESCE(created_at, now() AT TIME ZONE 'utc')
+        FROM task_activities_legacy
+    """)
+    op.drop_table('task_activities_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE task_activities RENAME TO task_activities_partitioned")
+    op.execute("ALTER TABLE task_activities_partitioned RENAME CONSTRAINT task_activities_pkey TO task_activities_partitioned_pkey")
+    op.execute("ALTER INDEX ix_task_activities_id RENAME TO ix_task_activities_partitioned_id")
+    op.execute("ALTER INDEX ix_task_activities_task_id_created_at RENAME TO ix_task_activities_partitioned_task_id_created_at")
+
+    op.execute("""
+        CREATE TABLE task_activities (
+            id INTEGER NOT NULL DEFAULT nextval('task_activities_id_seq'),
+            task_id INTEGER NOT NULL REFERENCES tasks (id),
+            user_id INTEGER NOT NULL REFERENCES users (id),
+            action VARCHAR(50) NOT NULL,
+            details TEXT,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT task_activities_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE task_activities_id_seq OWNED BY task_activities.id")
+    op.create_index('ix_task_activities_id', 'task_activities', ['id'], unique=False)
+    op.create_index('ix_task_activities_task_id_created_at', 'task_activities', ['task_id', 'created_at'], unique=False)
+    op.execute("""
+        INSERT INTO task_activities (id, task_id, user_id, action, details, created_at)
+        SELECT id, task_id, user_id, action, details, created_at FROM task_activities_partitioned
+    """)
+    op.drop_table('task_activities_partitioned')
@@ -0,0 +1,51 @@
+"""add deployment rollups
+
+Revision ID: b3e1d6c42a90
+Revises: 48158971fe0b
+Create Date: 2026-10-18 16:02:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e1d6c42a90'
+down_revision: Union[str, Sequence[str], None] = '48158971fe0b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('deployment_daily_rollups',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('environment', sa.String(length=50), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('successes', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('failures', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('restores', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('restore_seconds', sa.Float(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'environment', 'day')
+    )
+    op.create_table('deployment_environment_health',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('environment', sa.String(length=50), nullable=False),
+    sa.Column('last_status', postgresql.ENUM('PENDING', 'SUCCESS', 'FAILED', name='deploymentstatus', create_type=False), nullable=True),
+    sa.Column('last_deployed_at', sa.DateTime(), nullable=True),
+    sa.Column('failing_since', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id', 'environment')
+    )
+    # Existing deployments are rolled up by `python -m app.scripts.rebuild_dora`
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('deployment_environment_health')
+    op.drop_table('deployment_daily_rollups')
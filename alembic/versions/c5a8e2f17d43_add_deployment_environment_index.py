@@ -0,0 +1,34 @@
+"""add deployment environment index
+
+Revision ID: c5a8e2f17d43
+Revises: b3e1d6c42a90
+Create Date: 2026-10-18 16:48:55.402193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a8e2f17d43'
+down_revision: Union[str, Sequence[str], None] = 'b3e1d6c42a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Serves DISTINCT ON (environment) ... ORDER BY environment, deployed_at DESC
+    # for the environment status board without a sort
+    op.create_index(
+        'ix_deployments_project_id_environment_deployed_at', 'deployments',
+        ['project_id', 'environment', sa.text('deployed_at DESC')], unique=False,
+        postgresql_include=['version', 'status']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deployments_project_id_environment_deployed_at', table_name='deployments')
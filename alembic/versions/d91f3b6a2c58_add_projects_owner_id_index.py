@@ -0,0 +1,29 @@
+"""add projects owner_id index
+
+Revision ID: d91f3b6a2c58
+Revises: c5a8e2f17d43
+Create Date: 2026-10-18 17:21:40.561087
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91f3b6a2c58'
+down_revision: Union[str, Sequence[str], None] = 'c5a8e2f17d43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Owner arm of the project visibility predicate (GET /projects)
+    op.create_index(op.f('ix_projects_owner_id'), 'projects', ['owner_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_projects_owner_id'), table_name='projects')
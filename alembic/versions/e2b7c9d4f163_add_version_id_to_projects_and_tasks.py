@@ -0,0 +1,31 @@
+"""add version_id to projects and tasks
+
+Revision ID: e2b7c9d4f163
+Revises: d91f3b6a2c58
+Create Date: 2026-10-18 17:55:12.730419
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c9d4f163'
+down_revision: Union[str, Sequence[str], None] = 'd91f3b6a2c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default lets Postgres add the column without rewriting the table
+    op.add_column('projects', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('tasks', sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('tasks', 'version_id')
+    op.drop_column('projects', 'version_id')
@@ -1,16 +1,65 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 from sqlalchemy.future import select
 from fastapi import status
 
 from app.db.database import get_session
 from app.models.user import User
 from app.core.jwt import decode_access_token
+from app.core.cache import TTLCache
+from app.core.config import USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_SIZE
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+# Authenticated users keyed on the token subject, so repeat requests
+# skip the users lookup. Cached instances are detached from any session.
+# Changes committed through a session of this worker evict entries; other
+# workers (and raw SQL) keep serving the old user for up to the TTL.
+user_cache = TTLCache(max_size=USER_CACHE_MAX_SIZE, ttl=USER_CACHE_TTL_SECONDS)
+# Bumped on every eviction; a lookup that raced with one is not stored
+_user_cache_generation = 0
+
+CHANGED_USERS = "changed_user_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target):
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS, set()).add(str(target.id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _users_bulk_changed(state):
+    # Bulk UPDATE/DELETE on users: the affected ids are unknown
+    if (state.is_update or state.is_delete) and getattr(state.statement.table, "name", None) == User.__tablename__:
+        state.session.info[CHANGED_USERS] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session):
+    """Evict only once the change is visible, so no request can re-cache the old row"""
+    global _user_cache_generation
+    if CHANGED_USERS not in session.info:
+        return
+    changed = session.info.pop(CHANGED_USERS)
+    _user_cache_generation += 1
+    if changed is None:
+        user_cache.clear()
+    else:
+        for user_id in changed:
+            user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session):
+    session.info.pop(CHANGED_USERS, None)
+
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
@@ -27,12 +76,20 @@ async def get_current_user(
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    generation = _user_cache_generation
     result = await db.execute(select(User).where(User.id == int(user_id)))
     user = result.scalar_one_or_none()
 
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
 
+    db.expunge(user)
+    if generation == _user_cache_generation:
+        user_cache.set(user_id, user)
     return user
 
 
@@ -42,4 +99,4 @@ async def require_admin(current_user: User = Depends(get_current_user)):
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin privileges required"
         )
-    return current_user
\ No newline at end of file
+    return current_user
@@ -0,0 +1,59 @@
+from typing import Optional
+from fastapi import HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
+
+
+def entity_etag(kind: str, entity_id: int, *version_ids: int) -> str:
+    """Strong ETag for one row, from its version_id and those of any rows embedded in the response"""
+    return '"' + "-".join([kind, str(entity_id), *map(str, version_ids)]) + '"'
+
+
+def _etags(header: Optional[str]) -> list:
+    return [tag.strip() for tag in header.split(",")] if header else []
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A bodiless 304 when If-None-Match already has `etag`, else None"""
+    tags = _etags(request.headers.get("If-None-Match"))
+    # If-None-Match uses weak comparison
+    if "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return None
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """Reject the write with 412 unless If-Match is absent or names the current `etag`"""
+    header = request.headers.get("If-Match")
+    if header is None:
+        return
+    tags = _etags(header)
+    # If-Match uses strong comparison, so weak tags never match
+    if "*" not in tags and etag not in tags:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resource has changed since it was fetched"
+        )
+
+
+async def flush_versioned(db: AsyncSession, request: Request) -> None:
+    """Flush changes to versioned rows, turning a lost race into an HTTP error.
+
+    The UPDATE only matches the version that was read, so a concurrent
+    writer that committed first makes it fail with StaleDataError: 412 for
+    conditional requests, 409 otherwise. Call it before any other statement
+    in the transaction so autoflush cannot raise the error elsewhere.
+    """
+    try:
+        await db.flush()
+    except StaleDataError:
+        await db.rollback()
+        if request.headers.get("If-Match") is not None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Resource has changed since it was fetched"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Resource was modified concurrently, retry"
+        )
@@ -1,11 +1,19 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
 from jose import jwt
+from app.core.cache import TTLCache
+from app.core.config import JWT_CACHE_MAX_SIZE
 
 # Secret key (use a strong random string in production)
 SECRET_KEY = "your-very-strong-secret-key"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 hour
 
+# Already-verified tokens keyed by their SHA-256 digest; each entry
+# expires together with the token's own `exp` claim.
+token_cache = TTLCache(max_size=JWT_CACHE_MAX_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
 def create_access_token(data: dict, expires_delta: int = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=expires_delta or ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -14,4 +22,13 @@ def create_access_token(data: dict, expires_delta: int = None):
     return encoded_jwt
 
 def decode_access_token(token: str):
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return dict(payload)
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    if exp is not None:
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return dict(payload)
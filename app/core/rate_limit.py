@@ -0,0 +1,288 @@
+import logging
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from ipaddress import ip_address, ip_network
+from typing import Optional
+from fastapi import HTTPException, Request, status
+from fastapi.responses import ORJSONResponse
+from app.core.cache import TTLCache
+from app.core.config import (
+    RATE_LIMIT_ENABLED, RATE_LIMIT_REDIS_URL, RATE_LIMIT_MAX_KEYS,
+    LOGIN_RATE_LIMIT_BURST, LOGIN_RATE_LIMIT_PER_MINUTE,
+    LOGIN_USERNAME_RATE_LIMIT_BURST, LOGIN_USERNAME_RATE_LIMIT_PER_MINUTE, TRUSTED_PROXIES,
+    CICD_RATE_LIMIT_BURST, CICD_RATE_LIMIT_PER_MINUTE, CICD_MAX_IN_FLIGHT, CICD_MAX_IN_FLIGHT_PER_USER,
+)
+from app.db.routing import token_subject
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Budget for one expensive route, matched before routing by method and path.
+
+    Rules without a path are only spent explicitly, through `RateLimiter.check()`.
+    """
+    name: str
+    method: Optional[str]
+    path: Optional["re.Pattern"]
+    burst: int
+    per_minute: float
+    # Key authenticated requests by user; otherwise always by peer IP
+    by_user: bool = True
+    # Per-worker caps on requests running at once; 0 means no cap
+    max_in_flight: int = 0
+    max_in_flight_per_client: int = 0
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60
+
+
+RULES = (
+    # bcrypt runs before the credentials are known to be valid, so key by IP
+    RateLimitRule("login", "POST", re.compile(r"^/(login|register)$"),
+                  LOGIN_RATE_LIMIT_BURST, LOGIN_RATE_LIMIT_PER_MINUTE, by_user=False),
+    # Spent by /login per submitted username, so guessing one account's
+    # password from many addresses is slowed down too
+    RateLimitRule("login-username", None, None,
+                  LOGIN_USERNAME_RATE_LIMIT_BURST, LOGIN_USERNAME_RATE_LIMIT_PER_MINUTE),
+    # Holds a request open across a 60-120 s provider call
+    RateLimitRule("generate-cicd", "POST", re.compile(r"^/projects/\d+/generate-cicd$"),
+                  CICD_RATE_LIMIT_BURST, CICD_RATE_LIMIT_PER_MINUTE,
+                  max_in_flight=CICD_MAX_IN_FLIGHT, max_in_flight_per_client=CICD_MAX_IN_FLIGHT_PER_USER),
+)
+
+
+TRUSTED_PROXY_NETWORKS = [ip_network(proxy, strict=False) for proxy in TRUSTED_PROXIES]
+
+
+def _trusted_proxy(address: str) -> bool:
+    try:
+        address = ip_address(address)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXY_NETWORKS)
+
+
+def client_ip(request: Request) -> str:
+    """The peer address, or the nearest untrusted X-Forwarded-For hop when the peer is a trusted proxy"""
+    address = request.client.host if request.client else "unknown"
+    if not _trusted_proxy(address):
+        return address
+    for hop in reversed(request.headers.get("X-Forwarded-For", "").split(",")):
+        hop = hop.strip()
+        if hop:
+            address = hop
+            if not _trusted_proxy(hop):
+                break
+    return address
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+class LocalBuckets:
+    """Token buckets in this worker's memory.
+
+    An entry expires once its bucket would have refilled, so a missing
+    entry always means a full bucket and eviction never loses state that
+    matters except for the least recently limited clients.
+    """
+
+    name = "local"
+
+    def __init__(self, max_keys: int):
+        self._buckets = TTLCache(max_size=max_keys, ttl=0)
+
+    async def take(self, key: str, rule: RateLimitRule, now: float) -> float:
+        """Take one token; returns 0 if allowed, else seconds until one is available"""
+        tokens, updated_at = self._buckets.get(key) or (float(rule.burst), now)
+        tokens = min(float(rule.burst), tokens + (now - updated_at) * rule.refill_per_second)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rule.refill_per_second
+        self._buckets.set(key, (tokens, now), ttl=(rule.burst - tokens) / rule.refill_per_second)
+        return wait
+
+    def size(self) -> Optional[int]:
+        return self._buckets.stats()["size"]
+
+
+# Same algorithm as LocalBuckets, atomic in Redis and clocked by the Redis server
+_TAKE_SCRIPT = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or burst
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis"""
+
+    name = "redis"
+
+    def __init__(self, redis_url: str):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is set but the redis package is not installed")
+        self._redis = redis.from_url(redis_url)
+        self._take = self._redis.register_script(_TAKE_SCRIPT)
+
+    async def take(self, key: str, rule: RateLimitRule, now: float) -> float:
+        return float(await self._take(keys=[f"ratelimit:{key}"], args=[rule.burst, rule.refill_per_second]))
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class RateLimiter:
+    """Token-bucket admission control for the routes in `rules`.
+
+    Clients are the bearer token's subject, or the client IP (see
+    `client_ip`) for anonymous requests and rules with `by_user=False`. A request is rejected with 429
+    and Retry-After when its client's bucket is empty, or when the route
+    already has `max_in_flight` requests running in this worker
+    (`max_in_flight_per_client` for that client). Unmatched routes pass
+    straight through.
+    """
+
+    def __init__(self, rules, backend, enabled: bool = True):
+        self.rules = rules
+        self._rules_by_name = {rule.name: rule for rule in rules}
+        self.backend = backend
+        self.enabled = enabled
+        self.allowed = Counter()
+        self.limited = Counter()
+        self.saturated = Counter()
+        self.backend_errors = 0
+        self._in_flight = Counter()
+        self._in_flight_by_client = Counter()
+
+    def match(self, request: Request) -> Optional[RateLimitRule]:
+        for rule in self.rules:
+            if rule.path is not None and request.method == rule.method and rule.path.match(request.url.path):
+                return rule
+        return None
+
+    @staticmethod
+    def client_key(request: Request, rule: RateLimitRule) -> str:
+        subject = token_subject(request) if rule.by_user else None
+        if subject is not None:
+            return f"user:{subject}"
+        return f"ip:{client_ip(request)}"
+
+    def _saturated(self, rule: RateLimitRule, client: str) -> bool:
+        if rule.max_in_flight and self._in_flight[rule.name] >= rule.max_in_flight:
+            return True
+        return bool(
+            rule.max_in_flight_per_client
+            and self._in_flight_by_client[(rule.name, client)] >= rule.max_in_flight_per_client
+        )
+
+    async def _take(self, rule: RateLimitRule, client: str, now: float) -> float:
+        try:
+            return await self.backend.take(f"{rule.name}:{client}", rule, now)
+        except Exception:
+            # A broken shared backend must not take the routes down with it
+            self.backend_errors += 1
+            logger.exception("Rate limit backend failed, letting %s through", rule.name)
+            return 0.0
+
+    @staticmethod
+    def _reject(detail: str, wait: float) -> ORJSONResponse:
+        return ORJSONResponse(
+            {"detail": detail},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": retry_after(wait)}
+        )
+
+    async def check(self, name: str, key: str) -> None:
+        """Spend a token of rule `name` for `key` from inside a route; raises 429 when none is left"""
+        rule = self._rules_by_name[name]
+        if not self.enabled:
+            return
+        wait = await self._take(rule, key, time.monotonic())
+        if wait > 0:
+            self.limited[name] += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded",
+                headers={"Retry-After": retry_after(wait)}
+            )
+        self.allowed[name] += 1
+
+    async def __call__(self, request: Request, call_next):
+        rule = self.match(request) if self.enabled else None
+        if rule is None:
+            return await call_next(request)
+
+        client = self.client_key(request, rule)
+        # Check the in-flight caps first so a rejected request does not spend a token
+        if self._saturated(rule, client):
+            self.saturated[rule.name] += 1
+            return self._reject("Too many requests in progress, retry shortly", 1 / rule.refill_per_second)
+
+        wait = await self._take(rule, client, time.monotonic())
+        if wait > 0:
+            self.limited[rule.name] += 1
+            return self._reject("Rate limit exceeded", wait)
+
+        self.allowed[rule.name] += 1
+        self._in_flight[rule.name] += 1
+        self._in_flight_by_client[(rule.name, client)] += 1
+        try:
+            return await call_next(request)
+        finally:
+            self._in_flight[rule.name] -= 1
+            self._in_flight_by_client[(rule.name, client)] -= 1
+            if not self._in_flight_by_client[(rule.name, client)]:
+                del self._in_flight_by_client[(rule.name, client)]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "backend": self.backend.name,
+            "buckets": self.backend.size(),
+            "backend_errors": self.backend_errors,
+            "routes": {
+                rule.name: {
+                    "burst": rule.burst,
+                    "per_minute": rule.per_minute,
+                    "max_in_flight": rule.max_in_flight or None,
+                    "in_flight": self._in_flight[rule.name],
+                    "allowed": self.allowed[rule.name],
+                    "limited": self.limited[rule.name],
+                    "saturated": self.saturated[rule.name],
+                }
+                for rule in self.rules
+            },
+        }
+
+
+rate_limiter = RateLimiter(
+    RULES,
+    RedisBuckets(RATE_LIMIT_REDIS_URL) if RATE_LIMIT_REDIS_URL else LocalBuckets(RATE_LIMIT_MAX_KEYS),
+    enabled=RATE_LIMIT_ENABLED,
+)
@@ -1,7 +1,85 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
+from fastapi import HTTPException, status
+
+from app.core.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING
+
 
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+class PasswordHashPool:
+    """Runs bcrypt calls on a dedicated thread pool so they never block the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism.
+    At most `max_pending` calls may be queued or running; beyond that callers
+    get an immediate 503 instead of waiting behind the burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._workers = workers
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+        self.max_latency = 0.0
+
+    async def run(self, fn, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, retry shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        self._pending += 1
+        submitted = time.perf_counter()
+        started = submitted
+
+        def timed():
+            nonlocal started
+            started = time.perf_counter()
+            return fn(*args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            finished = time.perf_counter()
+            self._pending -= 1
+            self.completed += 1
+            self.total_wait += started - submitted
+            self.total_run += finished - started
+            self.max_latency = max(self.max_latency, finished - submitted)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self._workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else None,
+            "avg_run_ms": round(self.total_run / self.completed * 1000, 2) if self.completed else None,
+            "max_latency_ms": round(self.max_latency * 1000, 2),
+        }
+
+
+password_pool = PasswordHashPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
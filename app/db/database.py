@@ -1,9 +1,49 @@
+import time
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from app.core.config import DATABASE_URL  # we will create this next
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.config import DATABASE_URL, DB_PROFILE, ENGINE_OPTIONS
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts take to get a connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+
+def build_engine(url: str):
+    options = dict(ENGINE_OPTIONS)
+    # asyncpg prepared statement cache; set to 0 behind pgbouncer in transaction mode
+    statement_cache_size = options.pop("statement_cache_size")
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        connect_args={"prepared_statement_cache_size": statement_cache_size},
+        **options
+    )
+
 
 # Create async engine
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = build_engine(DATABASE_URL)
 
 # Create async session factory
 async_session = sessionmaker(
@@ -15,3 +55,19 @@ async_session = sessionmaker(
 async def get_session():
     async with async_session() as session:
         yield session
+
+
+def pool_stats(target=None) -> dict:
+    """Live connection pool statistics for an engine (the primary by default)"""
+    pool = (target or engine).pool
+    return {
+        "profile": DB_PROFILE,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "avg_wait_ms": round(pool.total_wait / pool.checkouts * 1000, 3) if pool.checkouts else None,
+        "max_wait_ms": round(pool.max_wait * 1000, 3),
+    }
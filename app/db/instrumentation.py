@@ -0,0 +1,132 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import SQL_INSTRUMENTATION_ENABLED, SQL_REPEAT_WARN_THRESHOLD
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class RequestQueryStats:
+    """Statements, commits and database time collected for one request"""
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+
+
+class SQLInstrumentation:
+    """Process-wide switch and totals for per-request SQL instrumentation"""
+
+    def __init__(self, enabled: bool, repeat_threshold: int):
+        self.enabled = enabled
+        self.repeat_threshold = repeat_threshold
+        self.requests = 0
+        self.statements = 0
+        self.commits = 0
+        self.db_time = 0.0
+        self.repeat_warnings = 0
+
+    def record(self, stats: RequestQueryStats) -> None:
+        self.requests += 1
+        self.statements += stats.statements
+        self.commits += stats.commits
+        self.db_time += stats.db_time
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "repeat_threshold": self.repeat_threshold,
+            "requests": self.requests,
+            "statements": self.statements,
+            "commits": self.commits,
+            "db_time_ms": round(self.db_time * 1000, 2),
+            "avg_statements_per_request": round(self.statements / self.requests, 2) if self.requests else None,
+            "repeat_warnings": self.repeat_warnings,
+        }
+
+
+instrumentation = SQLInstrumentation(SQL_INSTRUMENTATION_ENABLED, SQL_REPEAT_WARN_THRESHOLD)
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_start_time"):
+        return
+    stats.db_time += time.perf_counter() - conn.info["query_start_time"].pop()
+    stats.statements += 1
+    stats.shapes[_WHITESPACE.sub(" ", statement).strip()] += 1
+
+
+@event.listens_for(Engine, "commit")
+def _commit(conn):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.commits += 1
+
+
+def _streamed(response) -> bool:
+    """Whether the body is still being produced after the headers go out (StreamingResponse)"""
+    return "content-length" not in response.headers and response.status_code not in (204, 304)
+
+
+def _finish(request: Request, stats: RequestQueryStats) -> None:
+    instrumentation.record(stats)
+    for shape, count in stats.shapes.items():
+        if count > instrumentation.repeat_threshold:
+            instrumentation.repeat_warnings += 1
+            logger.warning(
+                "Possible N+1: %s %s ran the same statement %d times: %s",
+                request.method, request.url.path, count, shape[:200]
+            )
+
+
+async def _finish_after_body(body_iterator, request: Request, stats: RequestQueryStats):
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        _finish(request, stats)
+
+
+async def sql_instrumentation_middleware(request: Request, call_next):
+    if not instrumentation.enabled:
+        return await call_next(request)
+
+    stats = RequestQueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    # The route keeps running (in a task that still sees `stats`) while a
+    # streamed body is sent, so the headers would only cover the queries made
+    # before it. Leave them off and count the whole stream once it is done.
+    if _streamed(response):
+        response.body_iterator = _finish_after_body(response.body_iterator, request, stats)
+        return response
+
+    response.headers["X-DB-Statements"] = str(stats.statements)
+    response.headers["X-DB-Commits"] = str(stats.commits)
+    response.headers["X-DB-Time-Ms"] = f"{stats.db_time * 1000:.2f}"
+    _finish(request, stats)
+    return response
@@ -0,0 +1,125 @@
+import itertools
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+from app.core.cache import TTLCache
+from app.core.config import DATABASE_REPLICA_URLS, READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_REDIS_URL
+from app.core.jwt import decode_access_token
+from app.db.database import async_session, build_engine, engine
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+replica_engines = [build_engine(url) for url in DATABASE_REPLICA_URLS]
+replica_sessions = [
+    sessionmaker(bind=replica, class_=AsyncSession, expire_on_commit=False)
+    for replica in replica_engines
+]
+_replica_cycle = itertools.cycle(replica_sessions) if replica_sessions else None
+
+
+class RecentWriters:
+    """Token subjects that committed a write recently.
+
+    Their reads stay on the primary so they never see a replica that has
+    not caught up with their own write. Markers live in this worker's
+    TTLCache, so the guarantee only holds for reads served by the worker
+    that took the write, unless `redis_url` is set to share them.
+    """
+
+    def __init__(self, ttl: float, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self._local = TTLCache(max_size=100000, ttl=ttl)
+        self._redis = None
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("READ_YOUR_WRITES_REDIS_URL is set but the redis package is not installed")
+            self._redis = redis.from_url(redis_url)
+
+    @staticmethod
+    def key(subject: str) -> str:
+        return f"recent-writer:{subject}"
+
+    async def add(self, subject: str) -> None:
+        if self._redis is None:
+            self._local.set(subject, True)
+        else:
+            await self._redis.set(self.key(subject), 1, px=max(1, int(self.ttl * 1000)))
+
+    async def contains(self, subject: str) -> bool:
+        if self._redis is None:
+            return bool(self._local.get(subject))
+        return bool(await self._redis.exists(self.key(subject)))
+
+
+recent_writers = RecentWriters(READ_YOUR_WRITES_SECONDS, READ_YOUR_WRITES_REDIS_URL)
+
+# Set by record_writes_middleware for the current request; the commit hook
+# below flags it when a transaction that changed data commits on the primary
+_request_writes: ContextVar[Optional[dict]] = ContextVar("request_writes", default=None)
+
+
+@event.listens_for(engine.sync_engine, "before_cursor_execute")
+def _track_write(conn, cursor, statement, parameters, context, executemany):
+    if not statement.lstrip()[:6].upper().startswith(("SELECT", "SHOW")):
+        conn.info["wrote"] = True
+
+
+@event.listens_for(engine.sync_engine, "commit")
+def _commit(conn):
+    writes = _request_writes.get()
+    if conn.info.pop("wrote", False) and writes is not None:
+        writes["committed"] = True
+
+
+@event.listens_for(engine.sync_engine, "rollback")
+def _rollback(conn):
+    conn.info.pop("wrote", None)
+
+
+def token_subject(request: Request) -> Optional[str]:
+    """Best-effort user id from the bearer token, without touching the database"""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_access_token(token).get("sub")
+    except Exception:
+        return None
+
+
+async def read_sessionmaker(subject: Optional[str] = None):
+    """Session factory for read-only work: a replica unless the user just wrote"""
+    if _replica_cycle is None:
+        return async_session
+    if subject is not None and await recent_writers.contains(subject):
+        return async_session
+    return next(_replica_cycle)
+
+
+async def get_read_session(request: Request):
+    session_factory = await read_sessionmaker(token_subject(request))
+    async with session_factory() as session:
+        yield session
+
+
+async def record_writes_middleware(request: Request, call_next):
+    """Pin the user to the primary after a successful request that committed a write"""
+    if request.method in SAFE_METHODS:
+        return await call_next(request)
+
+    writes = {"committed": False}
+    token = _request_writes.set(writes)
+    try:
+        response = await call_next(request)
+    finally:
+        _request_writes.reset(token)
+
+    subject = token_subject(request)
+    if writes["committed"] and response.status_code < 400 and subject is not None:
+        await recent_writers.add(subject)
+    return response
@@ -1,18 +1,47 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routes import auth, projects, tasks, cicd, project_management
+from fastapi.responses import ORJSONResponse
+from app.routes import auth, projects, tasks, cicd, project_management, admin, deployments
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from fastapi import Depends
 from app.core.dependencies import require_admin
+from app.db.routing import record_writes_middleware
+from app.db.instrumentation import sql_instrumentation_middleware
+from app.core.rate_limit import rate_limiter
+from app.db.database import async_session
+from app.services.deployments.writer import deployment_writer
+from app.services.partitions import create_future_partitions
 
-app = FastAPI()
-app = FastAPI(title="Task & Deployment Tracker API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # There is no default activity partition: make sure this month and the
+    # next exist even when the maintenance job has stopped running
+    async with async_session() as db:
+        await create_future_partitions(db, months_ahead=1)
+        await db.commit()
+    deployment_writer.start()
+    yield
+    # Flush queued deployment reports before the worker exits
+    await deployment_writer.stop()
+
+
+# Response models produce plain JSON types, which orjson encodes much faster than the stdlib
+app = FastAPI(title="Task & Deployment Tracker API", lifespan=lifespan, default_response_class=ORJSONResponse)
+
+app.middleware("http")(record_writes_middleware)
+app.middleware("http")(sql_instrumentation_middleware)
+# Added last so it runs first and rejects floods before any other work
+app.middleware("http")(rate_limiter)
 
 app.include_router(auth.router)
 app.include_router(projects.router)
 app.include_router(tasks.router)
 app.include_router(cicd.router)
 app.include_router(project_management.router)
+app.include_router(admin.router)
+app.include_router(deployments.router)
 
 @app.get("/")
 def root():
@@ -8,6 +8,8 @@ from app.models.ai_generation import AIGeneration
 from app.models.project_students import project_students
 from app.models.project_supervisors import project_supervisors
 from app.models.project_feedback import ProjectFeedback
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.deployment_rollup import DeploymentDailyRollup, DeploymentEnvironmentHealth
 
 __all__ = [
     "User",
@@ -20,4 +22,7 @@ __all__ = [
     "project_students",
     "project_supervisors",
     "ProjectFeedback",
+    "ProjectTaskStats",
+    "DeploymentDailyRollup",
+    "DeploymentEnvironmentHealth",
 ]
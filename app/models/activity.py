@@ -1,17 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.models.user import Base
 
 class TaskActivity(Base):
     __tablename__ = "task_activities"
+    # Monthly range partitions on created_at, managed by app/services/partitions.py
+    __table_args__ = (
+        Index("ix_task_activities_task_id_created_at", "task_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     action = Column(String(50), nullable=False)
     details = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
     task = relationship("Task", backref="activities")
     user = relationship("User", backref="activities")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.user import Base
@@ -6,6 +6,9 @@ from app.models.user import Base
 
 class AIGeneration(Base):
     __tablename__ = "ai_generations"
+    __table_args__ = (
+        Index("ix_ai_generations_project_id_created_at", "project_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
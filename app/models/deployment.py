@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from datetime import datetime
@@ -12,6 +12,9 @@ class DeploymentStatus(PyEnum):
 
 class Deployment(Base):
     __tablename__ = "deployments"
+    __table_args__ = (
+        Index("ix_deployments_project_id_deployed_at", "project_id", "deployed_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
@@ -26,3 +29,11 @@ class Deployment(Base):
 
     def __repr__(self):
         return f"<Deployment(project_id={self.project_id}, env={self.environment}, status={self.status})>"
+
+
+# Latest deployment per environment (DISTINCT ON); INCLUDE carries the board columns
+Index(
+    "ix_deployments_project_id_environment_deployed_at",
+    Deployment.project_id, Deployment.environment, Deployment.deployed_at.desc(),
+    postgresql_include=["version", "status"],
+)
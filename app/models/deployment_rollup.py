@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, DateTime, Float, Enum
+from sqlalchemy.sql import func
+from app.models.user import Base
+from app.models.deployment import DeploymentStatus
+
+
+class DeploymentDailyRollup(Base):
+    """Finished deployments per project, environment and UTC day, updated by the deployment writer"""
+    __tablename__ = "deployment_daily_rollups"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    environment = Column(String(50), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    successes = Column(Integer, nullable=False, default=0, server_default="0")
+    failures = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Failure streaks ended by a success on this day
+    restores = Column(Integer, nullable=False, default=0, server_default="0")
+    restore_seconds = Column(Float, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<DeploymentDailyRollup(project_id={self.project_id}, env={self.environment}, day={self.day})>"
+
+
+class DeploymentEnvironmentHealth(Base):
+    """Latest outcome per project environment; `failing_since` is set while it is failing"""
+    __tablename__ = "deployment_environment_health"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    environment = Column(String(50), primary_key=True)
+
+    last_status = Column(Enum(DeploymentStatus), nullable=True)
+    last_deployed_at = Column(DateTime, nullable=True)
+    failing_since = Column(DateTime, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<DeploymentEnvironmentHealth(project_id={self.project_id}, env={self.environment})>"
@@ -10,8 +10,10 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100), nullable=False, unique=True, index=True)
     description = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Keep for backward compatibility
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)  # Keep for backward compatibility
     is_public = Column(Boolean, default=True)
+    # Bumped on every ORM update; backs ETags and optimistic concurrency
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")
 
     owner = relationship("User", backref="projects")
     stack = relationship("ProjectStack", back_populates="project", uselist=False)
@@ -21,5 +23,7 @@ class Project(Base):
     students = relationship("User", secondary=project_students, backref="student_projects")
     supervisors = relationship("User", secondary=project_supervisors, backref="supervised_projects")
 
+    __mapper_args__ = {"version_id_col": version_id}
+
     def __repr__(self):
         return f"<Project(name={self.name}, owner_id={self.owner_id})>"
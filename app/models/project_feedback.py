@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.models.user import Base
@@ -6,6 +6,9 @@ from app.models.user import Base
 
 class ProjectFeedback(Base):
     __tablename__ = "project_feedback"
+    __table_args__ = (
+        Index("ix_project_feedback_project_id_created_at", "project_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
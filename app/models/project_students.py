@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Table
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Table, Index
 from sqlalchemy.sql import func
 from app.models.user import Base
 
@@ -9,5 +9,7 @@ project_students = Table(
     Column('id', Integer, primary_key=True, index=True),
     Column('project_id', Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
     Column('student_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
-    Column('joined_at', DateTime(timezone=True), server_default=func.now())
+    Column('joined_at', DateTime(timezone=True), server_default=func.now()),
+    Index('uq_project_students_project_id_student_id', 'project_id', 'student_id', unique=True),
+    Index('ix_project_students_student_id', 'student_id')
 )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Table
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Table, Index
 from sqlalchemy.sql import func
 from app.models.user import Base
 
@@ -9,5 +9,7 @@ project_supervisors = Table(
     Column('id', Integer, primary_key=True, index=True),
     Column('project_id', Integer, ForeignKey('projects.id', ondelete='CASCADE'), nullable=False),
     Column('supervisor_id', Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
-    Column('assigned_at', DateTime(timezone=True), server_default=func.now())
+    Column('assigned_at', DateTime(timezone=True), server_default=func.now()),
+    Index('uq_project_supervisors_project_id_supervisor_id', 'project_id', 'supervisor_id', unique=True),
+    Index('ix_project_supervisors_supervisor_id', 'supervisor_id')
 )
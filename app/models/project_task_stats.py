@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from sqlalchemy.sql import func
+from app.models.user import Base
+
+
+class ProjectTaskStats(Base):
+    """Per-project task counts, kept current in the same transaction as task writes"""
+    __tablename__ = "project_task_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # TaskStatus
+    todo = Column(Integer, nullable=False, default=0, server_default="0")
+    in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    done = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # AssignmentStatus (unassigned = no assignment status)
+    unassigned = Column(Integer, nullable=False, default=0, server_default="0")
+    assignment_pending = Column(Integer, nullable=False, default=0, server_default="0")
+    assignment_accepted = Column(Integer, nullable=False, default=0, server_default="0")
+    assignment_rejected = Column(Integer, nullable=False, default=0, server_default="0")
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<ProjectTaskStats(project_id={self.project_id}, total={self.total})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Enum, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Enum, DateTime, Index
 from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 from datetime import datetime
@@ -17,6 +17,17 @@ class AssignmentStatus(PyEnum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index(
+            "ix_tasks_project_id_id", "project_id", "id",
+            postgresql_include=["title", "status", "assignee_id", "assignment_status", "working_user_id"]
+        ),
+        Index("ix_tasks_project_id_status_id", "project_id", "status", "id"),
+        Index("ix_tasks_project_id_assignee_id_id", "project_id", "assignee_id", "id"),
+        Index("ix_tasks_project_id_assignment_status_id", "project_id", "assignment_status", "id"),
+        Index("ix_tasks_project_id_working_user_id_id", "project_id", "working_user_id", "id"),
+        Index("ix_tasks_assignee_id_status", "assignee_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -27,11 +38,16 @@ class Task(Base):
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     assignment_status = Column(Enum(AssignmentStatus), nullable=True)
     working_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Bumped on every ORM update; backs ETags and optimistic concurrency.
+    # Core UPDATEs (bulk PATCH) must set it themselves.
+    version_id = Column(Integer, nullable=False, default=1, server_default="1")
 
     project = relationship("Project", backref="tasks")
     creator = relationship("User", foreign_keys=[creator_id], backref="tasks_created")
     assignee = relationship("User", foreign_keys=[assignee_id], backref="tasks_assigned")
     working_user = relationship("User", foreign_keys=[working_user_id], backref="tasks_working_on")
 
+    __mapper_args__ = {"version_id_col": version_id}
+
     def __repr__(self):
         return f"<Task(title={self.title}, status={self.status})>"
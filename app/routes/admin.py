@@ -0,0 +1,94 @@
+import io
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, File, Query, UploadFile
+from pydantic import BaseModel, Field
+from starlette.concurrency import iterate_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.user import User
+from app.core.dependencies import require_admin, user_cache
+from app.core.security import password_pool
+from app.core.jwt import token_cache
+from app.core.rate_limit import rate_limiter
+from app.db.database import get_session, pool_stats
+from app.db.routing import get_read_session, replica_engines
+from app.db.instrumentation import instrumentation
+from app.schemas.deployment import EnvironmentBoardEntry
+from app.services.deployments.board import environment_board, environment_board_cache
+from app.services.deployments.writer import deployment_writer
+from app.services.importer import TaskImporter, parse_records, read_csv, read_ndjson
+from app.services.membership_cache import membership_cache
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+class SQLInstrumentationUpdate(BaseModel):
+    enabled: bool
+    repeat_threshold: Optional[int] = Field(default=None, ge=1)
+
+
+@router.get("/metrics")
+async def get_metrics(current_user: User = Depends(require_admin)):
+    """In-process cache and runtime counters for this worker"""
+    return {
+        "user_cache": user_cache.stats(),
+        "password_hashing": password_pool.stats(),
+        "token_cache": token_cache.stats(),
+        "sql": instrumentation.stats(),
+        "deployment_writer": deployment_writer.stats(),
+        "environment_board_cache": environment_board_cache.stats(),
+        "membership_cache": membership_cache.stats(),
+        "rate_limiter": rate_limiter.stats(),
+    }
+
+
+@router.get("/environments", response_model=List[EnvironmentBoardEntry])
+async def get_environment_board(
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(require_admin)
+):
+    """Latest deployment in every environment of every project (cached per worker)"""
+    return await environment_board(db)
+
+
+@router.get("/db/pool")
+async def get_pool_stats(current_user: User = Depends(require_admin)):
+    """Live connection pool statistics for the primary and replica databases"""
+    return {
+        "primary": pool_stats(),
+        "replicas": [pool_stats(replica) for replica in replica_engines],
+    }
+
+
+@router.put("/sql-instrumentation")
+async def update_sql_instrumentation(
+    settings: SQLInstrumentationUpdate,
+    current_user: User = Depends(require_admin)
+):
+    """Switch per-request SQL instrumentation on or off for this worker"""
+    instrumentation.enabled = settings.enabled
+    if settings.repeat_threshold is not None:
+        instrumentation.repeat_threshold = settings.repeat_threshold
+    return instrumentation.stats()
+
+
+@router.post("/import/tasks")
+async def import_tasks(
+    file: UploadFile = File(...),
+    file_format: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format"),
+    table: Literal["tasks", "task_activities"] = "tasks",
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(require_admin)
+):
+    """Bulk-import tasks or task activities from CSV or NDJSON using COPY.
+
+    Same input formats as `python -m app.scripts.import_tasks`. Returns the
+    throughput report with any rejected rows.
+    """
+    file_format = file_format or ("csv" if (file.filename or "").endswith(".csv") else "ndjson")
+    source = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    records = read_csv(source, table) if file_format == "csv" else read_ndjson(source)
+
+    # Reading and validating the upload blocks; do it in the threadpool a chunk at a time
+    report = await TaskImporter(db).import_chunks(iterate_in_threadpool(parse_records(records)))
+    await db.commit()
+    return report
@@ -4,11 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.database import get_session
 from app.models.user import User
-from app.core.security import verify_password
+from app.core.security import verify_password_async
 from app.core.jwt import create_access_token
+from app.core.rate_limit import rate_limiter
 
 from app.schemas.user import UserCreate
-from app.core.security import hash_password
+from app.core.security import hash_password_async
 
 
 router = APIRouter()
@@ -18,12 +19,15 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_session)
 ):
+    # Per-IP limits are applied by the middleware; this one follows the account
+    await rate_limiter.check("login-username", form_data.username.lower())
+
     result = await db.execute(
         select(User).where(User.username == form_data.username)
     )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     access_token = create_access_token(
@@ -53,7 +57,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_session
     new_user = User(
         username=user_data.username,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password)
+        hashed_password=await hash_password_async(user_data.password)
     )
 
     db.add(new_user)
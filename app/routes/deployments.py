@@ -0,0 +1,148 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.db.database import get_session
+from app.db.routing import get_read_session
+from app.models.deployment import DeploymentStatus
+from app.models.project import Project
+from app.models.user import User
+from app.core.dependencies import get_current_user
+from app.services.permissions import PermissionService
+from app.schemas.deployment import EnvironmentDeployment
+from app.services.deployments.board import latest_deployments
+from app.services.deployments.dora import dora_metrics
+from app.services.deployments.writer import DeploymentEvent, deployment_writer
+
+router = APIRouter(tags=["Deployments"])
+
+DORA_DEFAULT_WINDOW_DAYS = 30
+
+class DeploymentReport(BaseModel):
+    environment: str = Field(..., min_length=1, max_length=50)
+    version: str = Field(..., min_length=1, max_length=50)
+    status: DeploymentStatus = DeploymentStatus.PENDING
+    deployed_at: Optional[datetime] = None
+
+class DeploymentBatchReport(BaseModel):
+    deployments: List[DeploymentReport] = Field(..., min_length=1, max_length=1000)
+
+
+async def get_reportable_project(project_id: int, current_user: User, db: AsyncSession) -> Project:
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    can_report = await PermissionService.can_report_deployments(current_user, project, db)
+    if not can_report:
+        raise HTTPException(status_code=403, detail="Not authorized to report deployments for this project")
+
+    return project
+
+def naive_utc(value: datetime) -> datetime:
+    """Deployment timestamps are stored as naive UTC"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def deployment_event(project_id: int, user_id: int, report: DeploymentReport, received_at: datetime) -> DeploymentEvent:
+    return DeploymentEvent(
+        project_id=project_id,
+        deployed_by_id=user_id,
+        environment=report.environment,
+        version=report.version,
+        status=report.status,
+        deployed_at=naive_utc(report.deployed_at or received_at),
+    )
+
+
+@router.post("/projects/{project_id}/deployments", status_code=status.HTTP_202_ACCEPTED)
+async def report_deployment(
+    project_id: int,
+    report: DeploymentReport,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Report a deployment from CI.
+
+    Send `pending` when a deployment starts and `success` or `failed` with the
+    same environment and version when it finishes. Reports are queued and
+    written in batches, so they may take a moment to show up.
+    """
+    await get_reportable_project(project_id, current_user, db)
+    deployment_writer.submit([deployment_event(project_id, current_user.id, report, datetime.utcnow())])
+    return {"accepted": 1}
+
+@router.post("/projects/{project_id}/deployments/batch", status_code=status.HTTP_202_ACCEPTED)
+async def report_deployments_batch(
+    project_id: int,
+    payload: DeploymentBatchReport,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Report many deployment events at once; either all are queued or none (503)"""
+    await get_reportable_project(project_id, current_user, db)
+    received_at = datetime.utcnow()
+    deployment_writer.submit([
+        deployment_event(project_id, current_user.id, report, received_at)
+        for report in payload.deployments
+    ])
+    return {"accepted": len(payload.deployments)}
+
+@router.get("/projects/{project_id}/environments", response_model=List[EnvironmentDeployment])
+async def get_project_environments(
+    project_id: int,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Current version and status of every environment the project has deployed to"""
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    can_access = await PermissionService.can_access_project(current_user, project, db)
+    if not can_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return await latest_deployments(db, project_id)
+
+@router.get("/projects/{project_id}/dora")
+async def get_dora_metrics(
+    project_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    environment: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    DORA metrics per environment over [start, end), from the daily rollups.
+
+    - **start** / **end**: window bounds (default: the last 30 days)
+    - **environment**: restrict to one environment
+    - Returns deployment frequency (successful deployments per day), change
+      failure rate and mean time to restore in seconds
+    """
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    can_access = await PermissionService.can_access_project(current_user, project, db)
+    if not can_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    end = naive_utc(end) if end else datetime.utcnow()
+    start = naive_utc(start) if start else end - timedelta(days=DORA_DEFAULT_WINDOW_DAYS)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    return await dora_metrics(db, project_id, start, end, environment)
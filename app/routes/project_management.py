@@ -1,52 +1,127 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from typing import Optional
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.database import get_session
+from app.db.routing import get_read_session
 from app.models.project import Project
 from app.models.user import User
 from app.models.project_feedback import ProjectFeedback
+from app.models.project_students import project_students
+from app.models.project_supervisors import project_supervisors
 from app.core.dependencies import get_current_user
+from app.core.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.services.permissions import PermissionService
-from app.schemas.project import ProjectMemberAdd, ProjectMemberRemove, FeedbackCreate, FeedbackResponse
+from app.schemas.pagination import Page
+from app.schemas.project import ProjectMemberAdd, ProjectMemberBulkAdd, ProjectMemberRemove, FeedbackCreate, FeedbackResponse
 
 router = APIRouter(prefix="/projects", tags=["Project Management"])
 
 
-@router.post("/{project_id}/students")
-async def add_student_to_project(
-    project_id: int,
-    member_data: ProjectMemberAdd,
-    db: AsyncSession = Depends(get_session),
-    current_user: User = Depends(get_current_user)
-):
-    """Add a student to a project (admin, owner, or supervisor only)"""
+async def get_project_or_404(db: AsyncSession, project_id: int) -> Project:
     result = await db.execute(select(Project).where(Project.id == project_id))
     project = result.scalar_one_or_none()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Only admin, owner, or supervisors can add students
+    return project
+
+def require_owner(current_user: User, project: Project) -> None:
+    # Only admin or owner can manage supervisors
+    if current_user.role != "admin" and project.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+async def require_modify(current_user: User, project: Project, db: AsyncSession) -> None:
+    # Admin, owner, or supervisors can manage students
     can_modify = await PermissionService.can_modify_project(current_user, project, db)
     if not can_modify:
         raise HTTPException(status_code=403, detail="Not authorized")
+
+async def member_candidates(db: AsyncSession, user_ids: list, role: str) -> tuple:
+    """Split user ids into ({id: username} with the right role, errors)"""
+    result = await db.execute(select(User.id, User.role, User.username).where(User.id.in_(set(user_ids))))
+    users = {row.id: row for row in result}
+    
+    valid, errors = {}, []
+    for user_id in dict.fromkeys(user_ids):
+        user = users.get(user_id)
+        if user is None:
+            errors.append({"user_id": user_id, "status": 404, "error": "User not found"})
+        elif user.role != role:
+            errors.append({"user_id": user_id, "status": 400, "error": f"User must have {role} role"})
+        else:
+            valid[user_id] = user.username
+    return valid, errors
+
+async def insert_members(db: AsyncSession, table, member_column: str, project_id: int, user_ids) -> list:
+    """Add memberships with one INSERT ... ON CONFLICT DO NOTHING; returns the ids actually added"""
+    result = await db.execute(
+        insert(table)
+        .values([{"project_id": project_id, member_column: user_id} for user_id in user_ids])
+        .on_conflict_do_nothing(index_elements=["project_id", member_column])
+        .returning(table.c[member_column])
+    )
+    added = result.scalars().all()
+    await db.commit()
+    await PermissionService.memberships_changed(db, added)
+    return added
+
+async def delete_member(db: AsyncSession, table, member_column: str, project_id: int, user_id: int) -> None:
+    await db.execute(delete(table).where(table.c.project_id == project_id, table.c[member_column] == user_id))
+    await db.commit()
+    await PermissionService.memberships_changed(db, [user_id])
+
+async def add_member(db: AsyncSession, table, member_column: str, project_id: int, user_id: int, role: str) -> str:
+    valid, errors = await member_candidates(db, [user_id], role)
+    if errors:
+        raise HTTPException(status_code=errors[0]["status"], detail=errors[0]["error"])
+    await insert_members(db, table, member_column, project_id, [user_id])
+    return valid[user_id]
+
+async def add_members(db: AsyncSession, table, member_column: str, project_id: int, user_ids: list, role: str) -> dict:
+    valid, errors = await member_candidates(db, user_ids, role)
+    added = await insert_members(db, table, member_column, project_id, list(valid)) if valid else []
+    return {
+        "added": sorted(added),
+        "already_members": sorted(set(valid) - set(added)),
+        "errors": [{"user_id": error["user_id"], "error": error["error"]} for error in errors],
+    }
+
+
+@router.post("/{project_id}/students")
+async def add_student_to_project(
+    project_id: int,
+    member_data: ProjectMemberAdd,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Add a student to a project (admin, owner, or supervisor only)"""
+    project = await get_project_or_404(db, project_id)
+    await require_modify(current_user, project, db)
     
-    # Get the student user
-    student_result = await db.execute(select(User).where(User.id == member_data.user_id))
-    student = student_result.scalar_one_or_none()
-    
-    if not student:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    if student.role != "student":
-        raise HTTPException(status_code=400, detail="User must have student role")
-    
-    # Add student to project
-    if student not in project.students:
-        project.students.append(student)
-        await db.commit()
+    username = await add_member(db, project_students, "student_id", project_id, member_data.user_id, "student")
+    return {"message": f"Student {username} added to project"}
+
+
+@router.post("/{project_id}/students/bulk")
+async def add_students_to_project(
+    project_id: int,
+    payload: ProjectMemberBulkAdd,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Enroll many students at once (admin, owner, or supervisor only).
+
+    Users that do not exist or are not students are reported under
+    `errors`; the rest are added in a single statement.
+    """
+    project = await get_project_or_404(db, project_id)
+    await require_modify(current_user, project, db)
     
-    return {"message": f"Student {student.username} added to project"}
+    return await add_members(db, project_students, "student_id", project_id, payload.user_ids, "student")
 
 
 @router.delete("/{project_id}/students/{user_id}")
@@ -57,23 +132,10 @@ async def remove_student_from_project(
     current_user: User = Depends(get_current_user)
 ):
     """Remove a student from a project"""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    can_modify = await PermissionService.can_modify_project(current_user, project, db)
-    if not can_modify:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    student_result = await db.execute(select(User).where(User.id == user_id))
-    student = student_result.scalar_one_or_none()
-    
-    if student and student in project.students:
-        project.students.remove(student)
-        await db.commit()
+    project = await get_project_or_404(db, project_id)
+    await require_modify(current_user, project, db)
     
+    await delete_member(db, project_students, "student_id", project_id, user_id)
     return {"message": "Student removed from project"}
 
 
@@ -85,30 +147,25 @@ async def add_supervisor_to_project(
     current_user: User = Depends(get_current_user)
 ):
     """Add a supervisor to a project (admin or owner only)"""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    # Only admin or owner can add supervisors
-    if current_user.role != "admin" and project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    supervisor_result = await db.execute(select(User).where(User.id == member_data.user_id))
-    supervisor = supervisor_result.scalar_one_or_none()
+    project = await get_project_or_404(db, project_id)
+    require_owner(current_user, project)
     
-    if not supervisor:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    if supervisor.role != "supervisor":
-        raise HTTPException(status_code=400, detail="User must have supervisor role")
-    
-    if supervisor not in project.supervisors:
-        project.supervisors.append(supervisor)
-        await db.commit()
+    username = await add_member(db, project_supervisors, "supervisor_id", project_id, member_data.user_id, "supervisor")
+    return {"message": f"Supervisor {username} added to project"}
+
+
+@router.post("/{project_id}/supervisors/bulk")
+async def add_supervisors_to_project(
+    project_id: int,
+    payload: ProjectMemberBulkAdd,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Add many supervisors at once (admin or owner only); see the student variant"""
+    project = await get_project_or_404(db, project_id)
+    require_owner(current_user, project)
     
-    return {"message": f"Supervisor {supervisor.username} added to project"}
+    return await add_members(db, project_supervisors, "supervisor_id", project_id, payload.user_ids, "supervisor")
 
 
 @router.delete("/{project_id}/supervisors/{user_id}")
@@ -119,22 +176,10 @@ async def remove_supervisor_from_project(
     current_user: User = Depends(get_current_user)
 ):
     """Remove a supervisor from a project"""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    project = result.scalar_one_or_none()
-    
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    if current_user.role != "admin" and project.owner_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    
-    supervisor_result = await db.execute(select(User).where(User.id == user_id))
-    supervisor = supervisor_result.scalar_one_or_none()
-    
-    if supervisor and supervisor in project.supervisors:
-        project.supervisors.remove(supervisor)
-        await db.commit()
+    project = await get_project_or_404(db, project_id)
+    require_owner(current_user, project)
     
+    await delete_member(db, project_supervisors, "supervisor_id", project_id, user_id)
     return {"message": "Supervisor removed from project"}
 
 
@@ -170,13 +215,15 @@ async def create_feedback(
     return feedback
 
 
-@router.get("/{project_id}/feedback")
+@router.get("/{project_id}/feedback", response_model=Page[FeedbackResponse])
 async def get_project_feedback(
     project_id: int,
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all feedback for a project"""
+    """Get feedback for a project, newest first, keyset-paginated on (created_at, id)"""
     result = await db.execute(select(Project).where(Project.id == project_id))
     project = result.scalar_one_or_none()
     
@@ -187,9 +234,10 @@ async def get_project_feedback(
     if not can_access:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    feedback_result = await db.execute(
-        select(ProjectFeedback).where(ProjectFeedback.project_id == project_id)
+    return await paginate(
+        db,
+        select(ProjectFeedback).where(ProjectFeedback.project_id == project_id),
+        (ProjectFeedback.created_at, ProjectFeedback.id),
+        cursor,
+        limit
     )
-    feedback_list = feedback_result.scalars().all()
-    
-    return feedback_list
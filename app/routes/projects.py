@@ -1,15 +1,27 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.db.database import get_session
+from app.db.routing import get_read_session, read_sessionmaker
 from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
 from app.models.user import User
 from app.core.dependencies import get_current_user
+from app.core.etag import entity_etag, not_modified, check_if_match, flush_versioned
+from app.core.pagination import paginate, DEFAULT_PAGE_SIZE
 from app.services.permissions import PermissionService
-from pydantic import BaseModel
+from app.services.export import export_project_ndjson, gzip_stream
+from app.services.task_stats import ASSIGNMENT_COLUMNS, COUNT_COLUMNS, STATUS_COLUMNS
+from app.schemas.pagination import Page
+from app.schemas.project import ProjectResponse
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
+PROJECT_LIST_MAX_PAGE_SIZE = 1000
+
 class ProjectCreate(BaseModel):
     name: str
     description: str = None
@@ -19,7 +31,10 @@ class ProjectUpdate(BaseModel):
     name: str = None
     description: str = None
 
-@router.post("/projects")
+class ProjectAccessCheck(BaseModel):
+    project_ids: List[int] = Field(..., min_length=1, max_length=PROJECT_LIST_MAX_PAGE_SIZE)
+
+@router.post("/projects", response_model=ProjectResponse)
 async def create_project(
     project_data: ProjectCreate,
     db: AsyncSession = Depends(get_session),
@@ -36,10 +51,43 @@ async def create_project(
     await db.refresh(new_project)
     return new_project
 
-@router.get("/projects/{project_id}")
+@router.get("/projects", response_model=Page[ProjectResponse])
+async def list_projects(
+    mine: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=PROJECT_LIST_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Projects the current user can see, newest first, keyset-paginated on id.
+
+    - **mine**: only projects the user owns or is a student/supervisor of
+    """
+    return await paginate(
+        db,
+        select(Project).where(PermissionService.visibility_clause(current_user, include_public=not mine)),
+        (Project.id,),
+        cursor,
+        limit
+    )
+
+@router.post("/projects/access")
+async def check_project_access(
+    payload: ProjectAccessCheck,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Which of the given projects the current user can access, in one query"""
+    accessible = await PermissionService.can_access_projects(current_user, payload.project_ids, db)
+    return {"accessible": sorted(accessible), "denied": sorted(set(payload.project_ids) - accessible)}
+
+@router.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int,
-    db: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(select(Project).where(Project.id == project_id))
@@ -53,12 +101,52 @@ async def get_project(
     if not can_access:
         raise HTTPException(status_code=403, detail="Access denied")
     
+    etag = entity_etag("project", project.id, project.version_id)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
     return project
 
-@router.put("/projects/{project_id}")
+@router.get("/projects/{project_id}/stats")
+async def get_project_stats(
+    project_id: int,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Task counts by status and assignment status, read from project_task_stats"""
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    can_access = await PermissionService.can_access_project(current_user, project, db)
+    if not can_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    result = await db.execute(select(ProjectTaskStats).where(ProjectTaskStats.project_id == project_id))
+    stats = result.scalar_one_or_none()
+    
+    # Projects without tasks have no stats row yet
+    counts = {column: getattr(stats, column) if stats else 0 for column in COUNT_COLUMNS}
+    return {
+        "project_id": project_id,
+        "total": counts["total"],
+        "by_status": {status.value: counts[column] for status, column in STATUS_COLUMNS.items()},
+        "by_assignment_status": {
+            (assignment_status.value if assignment_status else "unassigned"): counts[column]
+            for assignment_status, column in ASSIGNMENT_COLUMNS.items()
+        },
+        "updated_at": stats.updated_at if stats else None,
+    }
+
+@router.put("/projects/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int,
     project_data: ProjectUpdate,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -73,18 +161,23 @@ async def update_project(
     if not can_modify:
         raise HTTPException(status_code=403, detail="Not authorized to modify this project")
     
+    check_if_match(request, entity_etag("project", project.id, project.version_id))
+    
     if project_data.name:
         project.name = project_data.name
     if project_data.description:
         project.description = project_data.description
     
+    await flush_versioned(db, request)
     await db.commit()
     await db.refresh(project)
+    response.headers["ETag"] = entity_etag("project", project.id, project.version_id)
     return project
 
 @router.delete("/projects/{project_id}")
 async def delete_project(
     project_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -98,6 +191,42 @@ async def delete_project(
     if project.owner_id != current_user.id and current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Not authorized to delete this project")
     
+    check_if_match(request, entity_etag("project", project.id, project.version_id))
+    
     await db.delete(project)
+    await flush_versioned(db, request)
     await db.commit()
     return {"message": "Project deleted successfully"}
+
+@router.get("/projects/{project_id}/export")
+async def export_project(
+    project_id: int,
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream the project's tasks, activity history, feedback and AI generations as NDJSON"""
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    can_modify = await PermissionService.can_modify_project(current_user, project, db)
+    if not can_modify:
+        raise HTTPException(status_code=403, detail="Not authorized to export this project")
+    
+    # The stream outlives this request's session, so it opens its own
+    body = export_project_ndjson(project_id, await read_sessionmaker(str(current_user.id)))
+    filename = f"project-{project_id}-export.ndjson"
+    media_type = "application/x-ndjson"
+    if gzip:
+        body = gzip_stream(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,15 +1,23 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from sqlalchemy import Integer, cast, column, delete, func, insert, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
 from app.db.database import get_session
+from app.db.routing import get_read_session
 from app.models.task import Task, TaskStatus, AssignmentStatus
 from app.models.project import Project
 from app.models.user import User
 from app.models.activity import TaskActivity
 from app.core.dependencies import get_current_user
-from pydantic import BaseModel
-from typing import Optional
+from app.core.etag import entity_etag, not_modified, check_if_match, flush_versioned
+from app.core.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.services.permissions import PermissionService
+from app.services.task_stats import TaskStatsDelta
+from app.schemas.pagination import Page
+from app.schemas.task import TaskResponse, TaskDetailResponse, TaskListItem, TaskActivityResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 router = APIRouter()
 
@@ -25,7 +33,38 @@ class TaskUpdate(BaseModel):
     status: Optional[TaskStatus] = None
     assignee_id: Optional[int] = None
 
-async def log_activity(db: AsyncSession, task_id: int, user_id: int, action: str, details: str = None):
+class TaskBulkCreateItem(BaseModel):
+    title: str
+    description: Optional[str] = None
+    assignee_id: Optional[int] = None
+
+class TaskBulkCreate(BaseModel):
+    project_id: int
+    tasks: List[TaskBulkCreateItem] = Field(..., min_length=1, max_length=1000)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkUpdate(BaseModel):
+    project_id: int
+    tasks: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=1000)
+
+TITLE_MAX_LENGTH = Task.__table__.c.title.type.length
+
+# Columns clients may request from the task listing, and the default board view
+TASK_LIST_FIELDS = (
+    "id", "title", "description", "status", "project_id",
+    "creator_id", "assignee_id", "assignment_status", "working_user_id",
+)
+TASK_LIST_DEFAULT_FIELDS = ("id", "title", "status", "assignee_id", "assignment_status", "working_user_id")
+TASK_LIST_MAX_PAGE_SIZE = 1000
+
+def log_activity(db: AsyncSession, task_id: int, user_id: int, action: str, details: str = None):
+    """Queue a TaskActivity in the current transaction.
+
+    Nothing is written until the caller commits, so a task change and all of
+    its activity rows land atomically and are flushed as one batched INSERT.
+    """
     activity = TaskActivity(
         task_id=task_id,
         user_id=user_id,
@@ -33,9 +72,12 @@ async def log_activity(db: AsyncSession, task_id: int, user_id: int, action: str
         details=details
     )
     db.add(activity)
-    await db.commit()
 
-@router.post("/tasks")
+def activity_row(task_id: int, user_id: int, action: str, details: str = None) -> dict:
+    """Parameters for one task_activities row in a multi-row INSERT"""
+    return {"task_id": task_id, "user_id": user_id, "action": action, "details": details}
+
+@router.post("/tasks", response_model=TaskResponse)
 async def create_task(
     task_data: TaskCreate,
     db: AsyncSession = Depends(get_session),
@@ -61,19 +103,283 @@ async def create_task(
         assignment_status=AssignmentStatus.PENDING if task_data.assignee_id else None
     )
     db.add(new_task)
-    await db.commit()
-    await db.refresh(new_task)
+    await db.flush()
     
-    await log_activity(db, new_task.id, current_user.id, "created", f"Task created")
+    log_activity(db, new_task.id, current_user.id, "created", f"Task created")
     if task_data.assignee_id:
-        await log_activity(db, new_task.id, current_user.id, "assigned", f"Assigned to user {task_data.assignee_id}")
+        log_activity(db, new_task.id, current_user.id, "assigned", f"Assigned to user {task_data.assignee_id}")
     
+    stats = TaskStatsDelta()
+    stats.add(new_task.project_id, new_task.status, new_task.assignment_status)
+    await stats.apply(db)
+    await db.commit()
+    await db.refresh(new_task)
     return new_task
 
-@router.get("/tasks/{task_id}")
+async def get_owned_project(db: AsyncSession, project_id: int, current_user: User) -> Project:
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if project.owner_id != current_user.id and current_user.role != "admin":
+        raise HTTPException(status_code=403, detail="Only project owner can manage tasks in bulk")
+    
+    return project
+
+async def existing_user_ids(db: AsyncSession, user_ids: set) -> set:
+    if not user_ids:
+        return set()
+    result = await db.execute(select(User.id).where(User.id.in_(user_ids)))
+    return set(result.scalars().all())
+
+def task_field_error(title: Optional[str], assignee_id: Optional[int], known_users: set) -> Optional[str]:
+    if title is not None and not title.strip():
+        return "Title must not be empty"
+    if title is not None and len(title) > TITLE_MAX_LENGTH:
+        return f"Title must be at most {TITLE_MAX_LENGTH} characters"
+    if assignee_id is not None and assignee_id not in known_users:
+        return f"User {assignee_id} not found"
+    return None
+
+@router.post("/tasks/bulk")
+async def bulk_create_tasks(
+    payload: TaskBulkCreate,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Create many tasks in one project with a single multi-row INSERT.
+
+    Invalid items are reported under `errors` by their index in the request;
+    the remaining items are still created.
+    """
+    await get_owned_project(db, payload.project_id, current_user)
+    known_users = await existing_user_ids(db, {item.assignee_id for item in payload.tasks if item.assignee_id})
+    
+    rows, indexes, errors = [], [], []
+    for index, item in enumerate(payload.tasks):
+        error = task_field_error(item.title, item.assignee_id, known_users)
+        if error:
+            errors.append({"index": index, "error": error})
+            continue
+        indexes.append(index)
+        rows.append({
+            "title": item.title,
+            "description": item.description,
+            "project_id": payload.project_id,
+            "creator_id": current_user.id,
+            "assignee_id": item.assignee_id,
+            "assignment_status": AssignmentStatus.PENDING if item.assignee_id else None,
+        })
+    
+    created = []
+    if rows:
+        result = await db.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True), rows
+        )
+        task_ids = result.scalars().all()
+        
+        activities = []
+        for task_id, row in zip(task_ids, rows):
+            activities.append(activity_row(task_id, current_user.id, "created", "Task created"))
+            if row["assignee_id"]:
+                activities.append(activity_row(task_id, current_user.id, "assigned", f"Assigned to user {row['assignee_id']}"))
+        await db.execute(insert(TaskActivity), activities)
+        
+        stats = TaskStatsDelta()
+        for row in rows:
+            stats.add(payload.project_id, None, row["assignment_status"])
+        await stats.apply(db)
+        await db.commit()
+        
+        created = [{"index": index, "id": task_id} for index, task_id in zip(indexes, task_ids)]
+    
+    return {"created": created, "errors": errors}
+
+# Fields a bulk PATCH item may change; None in a VALUES row keeps the current value
+BULK_UPDATE_COLUMNS = ("title", "description", "status", "assignee_id", "assignment_status")
+
+async def apply_task_changes(db: AsyncSession, project_id: int, pending: dict, rows_by_id: dict) -> set:
+    """Apply `pending` ({task id: (index, changes, activities)}) in one UPDATE ... FROM (VALUES ...).
+
+    Each row only matches while the task is still at the version_id read by
+    the caller, and the match bumps it, so a task changed concurrently is
+    left alone. Returns the ids that were updated.
+    """
+    if not pending:
+        return set()
+    changed = values(
+        column("id", Integer),
+        column("expected_version", Integer),
+        *(column(name, Task.__table__.c[name].type) for name in BULK_UPDATE_COLUMNS),
+        name="changed",
+    ).data([
+        (task_id, rows_by_id[task_id].version_id, *(changes.get(name) for name in BULK_UPDATE_COLUMNS))
+        for task_id, (_, changes, _) in pending.items()
+    ])
+    result = await db.execute(
+        update(Task)
+        .where(
+            Task.id == changed.c.id,
+            Task.project_id == project_id,
+            Task.version_id == changed.c.expected_version,
+        )
+        .values(
+            version_id=Task.version_id + 1,
+            # A VALUES column that is NULL in every row is typed text, so cast back to the column type
+            **{
+                name: func.coalesce(cast(changed.c[name], Task.__table__.c[name].type), getattr(Task, name))
+                for name in BULK_UPDATE_COLUMNS
+            },
+        )
+        .returning(Task.id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(result.scalars().all())
+
+@router.patch("/tasks/bulk")
+async def bulk_update_tasks(
+    payload: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_user)
+):
+    """Update many tasks of one project with a single batched UPDATE.
+
+    Only fields present in an item are changed. Invalid items are reported
+    under `errors` by their index in the request, as are tasks someone else
+    changed after they were read here; the rest are applied.
+    """
+    await get_owned_project(db, payload.project_id, current_user)
+    
+    result = await db.execute(
+        select(Task.id, Task.status, Task.assignment_status, Task.version_id).where(
+            Task.project_id == payload.project_id,
+            Task.id.in_({item.id for item in payload.tasks})
+        )
+    )
+    rows_by_id = {row.id: row for row in result}
+    current_state = {task_id: (row.status, row.assignment_status) for task_id, row in rows_by_id.items()}
+    known_users = await existing_user_ids(db, {item.assignee_id for item in payload.tasks if item.assignee_id})
+    
+    pending, accepted, errors, seen = {}, [], [], set()
+    for index, item in enumerate(payload.tasks):
+        if item.id not in current_state:
+            errors.append({"index": index, "id": item.id, "error": "Task not found in project"})
+            continue
+        if item.id in seen:
+            errors.append({"index": index, "id": item.id, "error": "Task appears more than once in the batch"})
+            continue
+        error = task_field_error(item.title, item.assignee_id, known_users)
+        if error:
+            errors.append({"index": index, "id": item.id, "error": error})
+            continue
+        seen.add(item.id)
+        accepted.append({"index": index, "id": item.id})
+        
+        changes = item.model_dump(exclude_none=True, exclude={"id"})
+        if not changes:
+            continue
+        activities = []
+        if "assignee_id" in changes:
+            changes["assignment_status"] = AssignmentStatus.PENDING
+            activities.append(activity_row(item.id, current_user.id, "reassigned", f"Reassigned to user {item.assignee_id}"))
+        if "title" in changes:
+            activities.append(activity_row(item.id, current_user.id, "updated", "Title updated"))
+        if "description" in changes:
+            activities.append(activity_row(item.id, current_user.id, "updated", "Description updated"))
+        old_status, old_assignment_status = current_state[item.id]
+        if "status" in changes:
+            activities.append(activity_row(
+                item.id, current_user.id, "status_changed",
+                f"Status changed from {old_status.value if old_status else None} to {item.status.value}"
+            ))
+        pending[item.id] = (index, changes, activities)
+    
+    applied = await apply_task_changes(db, payload.project_id, pending, rows_by_id)
+    
+    updated = []
+    stats, activities = TaskStatsDelta(), []
+    for entry in accepted:
+        if entry["id"] not in pending:
+            updated.append(entry)
+        elif entry["id"] in applied:
+            updated.append(entry)
+            _, changes, task_activities = pending[entry["id"]]
+            activities.extend(task_activities)
+            old_state = current_state[entry["id"]]
+            stats.change(
+                payload.project_id,
+                old_state,
+                (changes.get("status", old_state[0]), changes.get("assignment_status", old_state[1]))
+            )
+        else:
+            errors.append({**entry, "error": "Task was modified concurrently, retry"})
+    errors.sort(key=lambda error: error["index"])
+    
+    if applied:
+        await db.execute(insert(TaskActivity), activities)
+        await stats.apply(db)
+        await db.commit()
+    
+    return {"updated": updated, "errors": errors}
+
+@router.get("/projects/{project_id}/tasks", response_model=Page[TaskListItem], response_model_exclude_unset=True)
+async def list_project_tasks(
+    project_id: int,
+    status: Optional[TaskStatus] = None,
+    assignee_id: Optional[int] = None,
+    assignment_status: Optional[AssignmentStatus] = None,
+    working_user_id: Optional[int] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return"),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=TASK_LIST_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_session),
+    current_user: User = Depends(get_current_user)
+):
+    """List a project's tasks, keyset-paginated on id.
+
+    Every filter combination is served by a (project_id, <filter>, id) index,
+    and the default field set is covered by ix_tasks_project_id_id.
+    """
+    result = await db.execute(select(Project).where(Project.id == project_id))
+    project = result.scalar_one_or_none()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    can_access = await PermissionService.can_access_project(current_user, project, db)
+    if not can_access:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    selected = TASK_LIST_DEFAULT_FIELDS
+    if fields:
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in requested if field not in TASK_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        selected = ("id",) + tuple(field for field in requested if field != "id")
+    
+    stmt = select(*(getattr(Task, field) for field in selected)).where(Task.project_id == project_id)
+    if status is not None:
+        stmt = stmt.where(Task.status == status)
+    if assignee_id is not None:
+        stmt = stmt.where(Task.assignee_id == assignee_id)
+    if assignment_status is not None:
+        stmt = stmt.where(Task.assignment_status == assignment_status)
+    if working_user_id is not None:
+        stmt = stmt.where(Task.working_user_id == working_user_id)
+    
+    page = await paginate(db, stmt, (Task.id,), cursor, limit, descending=False, scalars=False)
+    page["items"] = [dict(row._mapping) for row in page["items"]]
+    return page
+
+@router.get("/tasks/{task_id}", response_model=TaskDetailResponse)
 async def get_task(
     task_id: int,
-    db: AsyncSession = Depends(get_session),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
     result = await db.execute(
@@ -89,12 +395,20 @@ async def get_task(
         if task.project.owner_id != current_user.id and current_user.role != "admin":
             raise HTTPException(status_code=403, detail="Cannot view tasks in private project")
     
+    # The response embeds the project, so its version is part of the tag
+    etag = entity_etag("task", task.id, task.version_id, task.project.version_id)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
     return task
 
-@router.put("/tasks/{task_id}")
+@router.put("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     task_data: TaskUpdate,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -117,32 +431,42 @@ async def update_task(
     if not can_update:
         raise HTTPException(status_code=403, detail="Not authorized to update this task")
     
+    project_version = task.project.version_id
+    check_if_match(request, entity_etag("task", task.id, task.version_id, project_version))
+    old_state = (task.status, task.assignment_status)
+    
     # Only project owner or admin can change assignee
     if task_data.assignee_id is not None:
         if task.project.owner_id != current_user.id and current_user.role != "admin":
             raise HTTPException(status_code=403, detail="Only project owner can change assignee")
         task.assignee_id = task_data.assignee_id
         task.assignment_status = AssignmentStatus.PENDING if task_data.assignee_id else None
-        await log_activity(db, task_id, current_user.id, "reassigned", f"Reassigned to user {task_data.assignee_id}")
+        log_activity(db, task_id, current_user.id, "reassigned", f"Reassigned to user {task_data.assignee_id}")
     
     if task_data.title:
         task.title = task_data.title
-        await log_activity(db, task_id, current_user.id, "updated", "Title updated")
+        log_activity(db, task_id, current_user.id, "updated", "Title updated")
     if task_data.description:
         task.description = task_data.description
-        await log_activity(db, task_id, current_user.id, "updated", "Description updated")
+        log_activity(db, task_id, current_user.id, "updated", "Description updated")
     if task_data.status:
         old_status = task.status
         task.status = task_data.status
-        await log_activity(db, task_id, current_user.id, "status_changed", f"Status changed from {old_status.value} to {task_data.status.value}")
+        log_activity(db, task_id, current_user.id, "status_changed", f"Status changed from {old_status.value} to {task_data.status.value}")
     
+    await flush_versioned(db, request)
+    stats = TaskStatsDelta()
+    stats.change(task.project_id, old_state, (task.status, task.assignment_status))
+    await stats.apply(db)
     await db.commit()
     await db.refresh(task)
+    response.headers["ETag"] = entity_etag("task", task.id, task.version_id, project_version)
     return task
 
 @router.delete("/tasks/{task_id}")
 async def delete_task(
     task_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -163,7 +487,16 @@ async def delete_task(
     if not can_delete:
         raise HTTPException(status_code=403, detail="Only project owner or admin can delete tasks")
     
+    check_if_match(request, entity_etag("task", task.id, task.version_id, task.project.version_id))
+    
+    stats = TaskStatsDelta()
+    stats.remove(task.project_id, task.status, task.assignment_status)
+    await stats.apply(db)
+    
+    # task_activities has no ON DELETE CASCADE; drop the task's history with it
+    await db.execute(delete(TaskActivity).where(TaskActivity.task_id == task_id))
     await db.delete(task)
+    await flush_versioned(db, request)
     await db.commit()
     return {"message": "Task deleted successfully"}
 
@@ -171,6 +504,7 @@ async def delete_task(
 @router.post("/tasks/{task_id}/accept")
 async def accept_assignment(
     task_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -186,15 +520,20 @@ async def accept_assignment(
     if task.assignment_status != AssignmentStatus.PENDING:
         raise HTTPException(status_code=400, detail="Assignment already processed")
     
+    stats = TaskStatsDelta()
+    stats.change(task.project_id, (task.status, task.assignment_status), (task.status, AssignmentStatus.ACCEPTED))
     task.assignment_status = AssignmentStatus.ACCEPTED
+    log_activity(db, task_id, current_user.id, "accepted", "Accepted task assignment")
+    await flush_versioned(db, request)
+    await stats.apply(db)
     await db.commit()
-    await log_activity(db, task_id, current_user.id, "accepted", "Accepted task assignment")
     
     return {"message": "Assignment accepted"}
 
 @router.post("/tasks/{task_id}/reject")
 async def reject_assignment(
     task_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -210,16 +549,21 @@ async def reject_assignment(
     if task.assignment_status != AssignmentStatus.PENDING:
         raise HTTPException(status_code=400, detail="Assignment already processed")
     
+    stats = TaskStatsDelta()
+    stats.change(task.project_id, (task.status, task.assignment_status), (task.status, AssignmentStatus.REJECTED))
     task.assignment_status = AssignmentStatus.REJECTED
     task.assignee_id = None
+    log_activity(db, task_id, current_user.id, "rejected", "Rejected task assignment")
+    await flush_versioned(db, request)
+    await stats.apply(db)
     await db.commit()
-    await log_activity(db, task_id, current_user.id, "rejected", "Rejected task assignment")
     
     return {"message": "Assignment rejected"}
 
 @router.post("/tasks/{task_id}/start")
 async def start_task(
     task_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_user)
 ):
@@ -238,21 +582,30 @@ async def start_task(
     if task.working_user_id:
         raise HTTPException(status_code=400, detail="Task already being worked on")
     
+    stats = TaskStatsDelta()
+    stats.change(task.project_id, (task.status, task.assignment_status), (TaskStatus.IN_PROGRESS, task.assignment_status))
     task.working_user_id = current_user.id
     task.status = TaskStatus.IN_PROGRESS
+    log_activity(db, task_id, current_user.id, "started", "Started working on task")
+    await flush_versioned(db, request)
+    await stats.apply(db)
     await db.commit()
-    await log_activity(db, task_id, current_user.id, "started", "Started working on task")
     
     return {"message": "Task started", "working_user_id": current_user.id}
 
-@router.get("/tasks/{task_id}/activities")
+@router.get("/tasks/{task_id}/activities", response_model=Page[TaskActivityResponse])
 async def get_task_activities(
     task_id: int,
-    db: AsyncSession = Depends(get_session),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_read_session),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(TaskActivity).where(TaskActivity.task_id == task_id).order_by(TaskActivity.created_at.desc())
+    """Activity feed of a task, newest first, keyset-paginated on (created_at, id)"""
+    return await paginate(
+        db,
+        select(TaskActivity).where(TaskActivity.task_id == task_id),
+        (TaskActivity.created_at, TaskActivity.id),
+        cursor,
+        limit
     )
-    activities = result.scalars().all()
-    return activities
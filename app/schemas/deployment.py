@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from app.models.deployment import DeploymentStatus
+
+
+class EnvironmentDeployment(BaseModel):
+    """Latest deployment in one environment of a project"""
+    environment: str
+    version: str
+    status: Optional[DeploymentStatus]
+    deployed_at: Optional[datetime]
+    deployment_id: int
+    deployed_by_id: Optional[int]
+
+
+class EnvironmentBoardEntry(EnvironmentDeployment):
+    project_id: int
+    project_name: str
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page from app.core.pagination.paginate"""
+    items: List[T]
+    next_cursor: Optional[str]
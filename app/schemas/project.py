@@ -1,11 +1,28 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from datetime import datetime
 from typing import List, Optional
 
 
+class ProjectResponse(BaseModel):
+    id: int
+    name: str
+    description: Optional[str]
+    owner_id: int
+    is_public: Optional[bool]
+    version_id: int
+
+    class Config:
+        from_attributes = True
+
+
 class ProjectMemberAdd(BaseModel):
     user_id: int
 
 
+class ProjectMemberBulkAdd(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=5000)
+
+
 class ProjectMemberRemove(BaseModel):
     user_id: int
 
@@ -21,8 +38,8 @@ class FeedbackResponse(BaseModel):
     user_id: Optional[int]
     feedback_type: str
     content: str
-    created_at: str
-    updated_at: Optional[str]
+    created_at: datetime
+    updated_at: Optional[datetime]
 
     class Config:
         from_attributes = True
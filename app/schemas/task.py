@@ -0,0 +1,51 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+from app.models.task import TaskStatus, AssignmentStatus
+from app.schemas.project import ProjectResponse
+
+
+class TaskResponse(BaseModel):
+    id: int
+    title: str
+    description: Optional[str]
+    status: Optional[TaskStatus]
+    project_id: int
+    creator_id: int
+    assignee_id: Optional[int]
+    assignment_status: Optional[AssignmentStatus]
+    working_user_id: Optional[int]
+    version_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class TaskDetailResponse(TaskResponse):
+    project: ProjectResponse
+
+
+class TaskListItem(BaseModel):
+    # The task listing returns only the fields the client asked for;
+    # serialize with response_model_exclude_unset so the rest are left out
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    project_id: Optional[int] = None
+    creator_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    assignment_status: Optional[AssignmentStatus] = None
+    working_user_id: Optional[int] = None
+
+
+class TaskActivityResponse(BaseModel):
+    id: int
+    task_id: int
+    user_id: int
+    action: str
+    details: Optional[str]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
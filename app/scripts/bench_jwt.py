@@ -0,0 +1,24 @@
+import timeit
+from jose import jwt
+from app.core.jwt import create_access_token, decode_access_token, token_cache, SECRET_KEY, ALGORITHM
+
+ITERATIONS = 20000
+
+
+def bench():
+    token = create_access_token({"sub": "1", "role": "student"})
+
+    uncached = timeit.timeit(lambda: jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]), number=ITERATIONS)
+
+    token_cache.clear()
+    decode_access_token(token)  # warm the cache
+    cached = timeit.timeit(lambda: decode_access_token(token), number=ITERATIONS)
+
+    print(f"Iterations:       {ITERATIONS}")
+    print(f"jwt.decode:       {uncached / ITERATIONS * 1e6:.2f} us/op")
+    print(f"cached decode:    {cached / ITERATIONS * 1e6:.2f} us/op")
+    print(f"Speedup:          {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,61 @@
+import timeit
+from datetime import datetime, timedelta
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from app.models.activity import TaskActivity
+from app.models.task import Task, TaskStatus, AssignmentStatus
+from app.schemas.pagination import Page
+from app.schemas.task import TaskResponse, TaskActivityResponse
+
+ITEMS = 1000
+ITERATIONS = 50
+
+
+def tasks() -> list:
+    return [
+        Task(
+            id=i, title=f"Task {i}", description="Lorem ipsum " * 10, status=TaskStatus.IN_PROGRESS,
+            project_id=1, creator_id=1, assignee_id=2, assignment_status=AssignmentStatus.ACCEPTED,
+            working_user_id=2, version_id=1,
+        )
+        for i in range(ITEMS)
+    ]
+
+
+def activities() -> list:
+    now = datetime.utcnow()
+    return [
+        TaskActivity(
+            id=i, task_id=1, user_id=2, action="status_changed",
+            details="Status changed from todo to in_progress", created_at=now - timedelta(seconds=i),
+        )
+        for i in range(ITEMS)
+    ]
+
+
+def bench_page(name: str, items: list, schema) -> None:
+    page = {"items": items, "next_cursor": "WzEyMzQ1XQ"}
+    adapter = TypeAdapter(Page[schema])
+
+    # Before: no response_model, so FastAPI walks the ORM objects with jsonable_encoder
+    before = timeit.timeit(lambda: JSONResponse(jsonable_encoder(page)), number=ITERATIONS)
+    # After: the response model validates and dumps the page, orjson renders it
+    after = timeit.timeit(
+        lambda: ORJSONResponse(adapter.dump_python(adapter.validate_python(page), mode="json")),
+        number=ITERATIONS,
+    )
+
+    print(f"{name} ({ITEMS} items, {ITERATIONS} iterations)")
+    print(f"  jsonable_encoder + json:     {before / ITERATIONS * 1e3:.2f} ms/page")
+    print(f"  response model + orjson:     {after / ITERATIONS * 1e3:.2f} ms/page")
+    print(f"  Speedup:                     {before / after:.1f}x")
+
+
+def bench():
+    bench_page("Tasks", tasks(), TaskResponse)
+    bench_page("Task activities", activities(), TaskActivityResponse)
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,43 @@
+"""
+Bulk-import tasks and task activities with PostgreSQL COPY.
+
+NDJSON input uses the project export format (one {"type", "data"} object per
+line, types "task" and "task_activity"). CSV input holds a single table, named
+with --table. Invalid rows are skipped and reported; everything else is
+imported in one transaction.
+
+    python -m app.scripts.import_tasks tasks.ndjson
+    python -m app.scripts.import_tasks activities.csv --table task_activities
+"""
+import argparse
+import asyncio
+import json
+from app.db.database import async_session, engine
+from app.services.importer import TaskImporter, read_csv, read_ndjson
+
+
+async def import_file(path: str, file_format: str, table: str, batch_size: int):
+    async with async_session() as db:
+        with open(path, newline="", encoding="utf-8") as source:
+            records = read_csv(source, table) if file_format == "csv" else read_ndjson(source)
+            report = await TaskImporter(db, batch_size).import_records(records)
+        await db.commit()
+
+    await engine.dispose()
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or NDJSON file to import")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="defaults to the file extension")
+    parser.add_argument("--table", choices=("tasks", "task_activities"), default="tasks", help="target table for CSV input")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    file_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+    asyncio.run(import_file(args.path, file_format, args.table, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
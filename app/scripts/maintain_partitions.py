@@ -0,0 +1,43 @@
+"""
+Maintain the monthly task_activities partitions.
+
+Creates partitions for the coming months and archives partitions older than
+the retention window to gzip CSV files before dropping them. Run it daily,
+e.g. from cron:
+
+    python -m app.scripts.maintain_partitions
+"""
+import argparse
+import asyncio
+from app.core.config import ACTIVITY_PARTITIONS_AHEAD, ACTIVITY_RETENTION_MONTHS, ACTIVITY_ARCHIVE_DIR
+from app.db.database import async_session, engine
+from app.services.partitions import create_future_partitions, archive_old_partitions
+
+
+async def maintain(months_ahead: int, retention_months: int, archive_dir: str):
+    async with async_session() as db:
+        created = await create_future_partitions(db, months_ahead)
+        await db.commit()
+    archived = await archive_old_partitions(engine, retention_months, archive_dir)
+
+    await engine.dispose()
+    for month in created:
+        print(f"✓ Created partition for {month:%Y-%m}")
+    for path in archived:
+        print(f"✓ Archived {path}")
+    if not created and not archived:
+        print("Partitions are up to date.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ahead", type=int, default=ACTIVITY_PARTITIONS_AHEAD, help="months to create ahead of the current one")
+    parser.add_argument("--retention-months", type=int, default=ACTIVITY_RETENTION_MONTHS, help="months of activity kept online")
+    parser.add_argument("--archive-dir", default=ACTIVITY_ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    asyncio.run(maintain(args.ahead, args.retention_months, args.archive_dir))
+
+
+if __name__ == "__main__":
+    main()
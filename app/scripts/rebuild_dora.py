@@ -0,0 +1,37 @@
+"""
+Recompute the DORA rollups (deployment_daily_rollups and
+deployment_environment_health) from the deployments table.
+
+Run it once after the migration that adds the rollup tables, and to repair
+drift from deployments reported out of order. Reports written while a
+project is being rebuilt may be counted twice; run it when CI is quiet or
+re-run it for the affected projects.
+
+    python -m app.scripts.rebuild_dora               # every project
+    python -m app.scripts.rebuild_dora --project 12  # selected projects
+"""
+import argparse
+import asyncio
+from app.db.database import async_session, engine
+from app.services.deployments.dora import rebuild_dora_rollups
+
+
+async def rebuild(project_ids):
+    async with async_session() as db:
+        rebuilt = await rebuild_dora_rollups(db, project_ids)
+        await db.commit()
+
+    await engine.dispose()
+    print(f"✓ Rebuilt DORA rollups for {rebuilt} project(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project", type=int, action="append", dest="project_ids", help="project id (repeatable)")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.project_ids))
+
+
+if __name__ == "__main__":
+    main()
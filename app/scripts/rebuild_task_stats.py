@@ -0,0 +1,33 @@
+"""
+Recount project_task_stats from the tasks table.
+
+Repairs drift after manual data fixes or imports that bypass the API.
+
+    python -m app.scripts.rebuild_task_stats               # every project
+    python -m app.scripts.rebuild_task_stats --project 12  # selected projects
+"""
+import argparse
+import asyncio
+from app.db.database import async_session, engine
+from app.services.task_stats import rebuild_task_stats
+
+
+async def rebuild(project_ids):
+    async with async_session() as db:
+        rebuilt = await rebuild_task_stats(db, project_ids)
+        await db.commit()
+
+    await engine.dispose()
+    print(f"✓ Rebuilt task stats for {rebuilt} project(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project", type=int, action="append", dest="project_ids", help="project id (repeatable)")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild(args.project_ids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.cache import TTLCache
+from app.core.config import ENVIRONMENT_BOARD_TTL_SECONDS
+from app.models.deployment import Deployment
+from app.models.project import Project
+
+# The admin board is one entry; the deployment writer clears it after each flush
+environment_board_cache = TTLCache(max_size=1, ttl=ENVIRONMENT_BOARD_TTL_SECONDS)
+BOARD_KEY = "all"
+# Bumped on every invalidation; a refill that raced with one is not stored
+_board_generation = 0
+
+
+def _deployment_dict(row) -> dict:
+    return {
+        "environment": row.environment,
+        "version": row.version,
+        "status": row.status.value if row.status else None,
+        "deployed_at": row.deployed_at,
+        "deployment_id": row.id,
+        "deployed_by_id": row.deployed_by_id,
+    }
+
+
+async def latest_deployments(db: AsyncSession, project_id: int) -> list:
+    """Most recent deployment in each environment of a project"""
+    result = await db.execute(
+        select(
+            Deployment.id, Deployment.environment, Deployment.version,
+            Deployment.status, Deployment.deployed_at, Deployment.deployed_by_id,
+        )
+        .where(Deployment.project_id == project_id)
+        .distinct(Deployment.environment)
+        .order_by(Deployment.environment, Deployment.deployed_at.desc())
+    )
+    return [_deployment_dict(row) for row in result]
+
+
+async def environment_board(db: AsyncSession) -> list:
+    """Latest deployment per environment across all projects, cached"""
+    board: Optional[list] = environment_board_cache.get(BOARD_KEY)
+    if board is not None:
+        return board
+
+    generation = _board_generation
+    latest = (
+        select(
+            Deployment.id, Deployment.project_id, Deployment.environment, Deployment.version,
+            Deployment.status, Deployment.deployed_at, Deployment.deployed_by_id,
+        )
+        .distinct(Deployment.project_id, Deployment.environment)
+        .order_by(Deployment.project_id, Deployment.environment, Deployment.deployed_at.desc())
+        .subquery()
+    )
+    result = await db.execute(
+        select(latest, Project.name.label("project_name"))
+        .join(Project, Project.id == latest.c.project_id)
+        .order_by(latest.c.project_id, latest.c.environment)
+    )
+    board = [
+        {"project_id": row.project_id, "project_name": row.project_name, **_deployment_dict(row)}
+        for row in result
+    ]
+    if generation == _board_generation:
+        environment_board_cache.set(BOARD_KEY, board)
+    return board
+
+
+def invalidate_environment_board() -> None:
+    global _board_generation
+    _board_generation += 1
+    environment_board_cache.invalidate(BOARD_KEY)
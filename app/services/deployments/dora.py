@@ -0,0 +1,351 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import delete, distinct, func, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import aliased
+from app.models.deployment import Deployment, DeploymentStatus
+from app.models.deployment_rollup import DeploymentDailyRollup, DeploymentEnvironmentHealth
+
+EPOCH = datetime(1970, 1, 1)
+DAY_SECONDS = 86400
+
+# (project_id, environment, status, deployed_at) of a deployment that just finished
+Outcome = Tuple[int, str, DeploymentStatus, datetime]
+
+
+def to_seconds(timestamps: Iterable[datetime]) -> np.ndarray:
+    """Naive UTC datetimes as float seconds since the epoch"""
+    return np.array(list(timestamps), dtype="datetime64[us]").astype(np.int64) / 1e6
+
+
+def from_seconds(seconds: float) -> datetime:
+    return EPOCH + timedelta(seconds=float(seconds))
+
+
+def replay_restores(times: np.ndarray, failed: np.ndarray, failing_since: float = np.nan) -> tuple:
+    """Walk one environment's finished deployments in time order.
+
+    A failure streak starts at the first failure after a success and ends at
+    the next success. Returns the times of the successes that ended a streak,
+    the seconds each streak lasted, and when the still-open streak started
+    (NaN if the last deployment succeeded). `failing_since` is the start of
+    a streak already open before `times[0]`.
+    """
+    if times.size == 0:
+        return np.empty(0), np.empty(0), failing_since
+
+    success = ~failed
+    # Successes before each event: a streak's events share this number
+    streak = np.cumsum(success) - success
+    first_failure = np.full(int(streak[-1]) + 2, np.inf)
+    np.minimum.at(first_failure, streak[failed], times[failed])
+    if not np.isnan(failing_since):
+        first_failure[0] = min(first_failure[0], failing_since)
+
+    success_times = times[success]
+    durations = success_times - first_failure[streak[success]]
+    restored = np.isfinite(durations)
+
+    open_streak = int(streak[-1]) + (1 if success[-1] else 0)
+    still_failing = first_failure[open_streak] if failed[-1] else np.nan
+    return success_times[restored], durations[restored], still_failing
+
+
+def daily_totals(times: np.ndarray, failed: np.ndarray, restore_times: np.ndarray, durations: np.ndarray) -> dict:
+    """{day: [successes, failures, restores, restore_seconds]} for one environment"""
+    event_days = np.floor(times / DAY_SECONDS).astype(np.int64)
+    restore_days = np.floor(restore_times / DAY_SECONDS).astype(np.int64)
+    days = np.unique(np.concatenate([event_days, restore_days]))
+    event_index = np.searchsorted(days, event_days)
+    restore_index = np.searchsorted(days, restore_days)
+
+    size = len(days)
+    successes = np.bincount(event_index, weights=(~failed).astype(float), minlength=size)
+    failures = np.bincount(event_index, weights=failed.astype(float), minlength=size)
+    restores = np.bincount(restore_index, minlength=size)
+    restore_seconds = np.bincount(restore_index, weights=durations, minlength=size)
+    return {
+        EPOCH.date() + timedelta(days=int(day)): [int(successes[i]), int(failures[i]), int(restores[i]), float(restore_seconds[i])]
+        for i, day in enumerate(days)
+    }
+
+
+async def record_outcomes(db: AsyncSession, outcomes: List[Outcome]) -> None:
+    """Fold finished deployments into the daily rollups, in the caller's transaction.
+
+    Outcomes older than an environment's latest recorded deployment still
+    count towards success and failure totals but do not affect
+    time-to-restore; `rebuild_dora_rollups` recomputes those exactly.
+    """
+    if not outcomes:
+        return
+
+    groups = defaultdict(list)
+    for project_id, environment, status, deployed_at in outcomes:
+        groups[(project_id, environment)].append((deployed_at, status == DeploymentStatus.FAILED))
+    keys = sorted(groups)
+
+    # Lock the environments in a fixed order so concurrent writers serialize instead of deadlocking
+    health_table = DeploymentEnvironmentHealth.__table__
+    await db.execute(
+        insert(health_table)
+        .values([{"project_id": project_id, "environment": environment} for project_id, environment in keys])
+        .on_conflict_do_nothing()
+    )
+    result = await db.execute(
+        select(health_table)
+        .where(tuple_(health_table.c.project_id, health_table.c.environment).in_(keys))
+        .order_by(health_table.c.project_id, health_table.c.environment)
+        .with_for_update()
+    )
+    health = {(row.project_id, row.environment): row for row in result}
+
+    rollups, health_rows = [], []
+    for key in keys:
+        events = sorted(groups[key])
+        times = to_seconds(deployed_at for deployed_at, _ in events)
+        failed = np.array([is_failure for _, is_failure in events], dtype=bool)
+        state = health[key]
+
+        in_order = np.ones(times.size, dtype=bool)
+        if state.last_deployed_at is not None:
+            in_order = times >= to_seconds([state.last_deployed_at])[0]
+        failing_since = to_seconds([state.failing_since])[0] if state.failing_since else np.nan
+        restore_times, durations, failing_since = replay_restores(times[in_order], failed[in_order], failing_since)
+
+        for day, totals in daily_totals(times, failed, restore_times, durations).items():
+            rollups.append(dict(zip(
+                ("project_id", "environment", "day", "successes", "failures", "restores", "restore_seconds"),
+                (*key, day, *totals)
+            )))
+
+        health_row = {
+            "project_id": key[0],
+            "environment": key[1],
+            "last_status": state.last_status,
+            "last_deployed_at": state.last_deployed_at,
+            "failing_since": state.failing_since,
+        }
+        if in_order.any():
+            health_row.update(
+                last_status=DeploymentStatus.FAILED if failed[in_order][-1] else DeploymentStatus.SUCCESS,
+                last_deployed_at=from_seconds(times[in_order][-1]),
+                failing_since=None if np.isnan(failing_since) else from_seconds(failing_since),
+            )
+        health_rows.append(health_row)
+
+    stmt = insert(DeploymentDailyRollup).values(rollups)
+    table = DeploymentDailyRollup.__table__
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[table.c.project_id, table.c.environment, table.c.day],
+        set_={column: table.c[column] + stmt.excluded[column] for column in ("successes", "failures", "restores", "restore_seconds")}
+    ))
+
+    stmt = insert(health_table).values(health_rows)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[health_table.c.project_id, health_table.c.environment],
+        set_={
+            "last_status": stmt.excluded.last_status,
+            "last_deployed_at": stmt.excluded.last_deployed_at,
+            "failing_since": stmt.excluded.failing_since,
+            "updated_at": func.now(),
+        }
+    ))
+
+
+async def rebuild_dora_rollups(db: AsyncSession, project_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute rollups and environment health from the deployments table; returns projects rebuilt"""
+    if project_ids is None:
+        result = await db.execute(select(distinct(Deployment.project_id)))
+        project_ids = result.scalars().all()
+    project_ids = sorted(set(project_ids))
+
+    for project_id in project_ids:
+        await db.execute(delete(DeploymentDailyRollup).where(DeploymentDailyRollup.project_id == project_id))
+        await db.execute(delete(DeploymentEnvironmentHealth).where(DeploymentEnvironmentHealth.project_id == project_id))
+
+        result = await db.execute(
+            select(Deployment.environment, Deployment.deployed_at, Deployment.status)
+            .where(Deployment.project_id == project_id, Deployment.status != DeploymentStatus.PENDING)
+            .order_by(Deployment.environment, Deployment.deployed_at)
+        )
+        rows = result.all()
+        if not rows:
+            continue
+
+        environments = np.array([row.environment for row in rows], dtype=object)
+        times = to_seconds(row.deployed_at for row in rows)
+        failed = np.array([row.status == DeploymentStatus.FAILED for row in rows], dtype=bool)
+        # Rows are sorted by environment, so each one is a contiguous slice
+        boundaries = np.flatnonzero(environments[1:] != environments[:-1]) + 1
+        rollups, health_rows = [], []
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(rows)]):
+            environment = environments[start]
+            restore_times, durations, failing_since = replay_restores(times[start:end], failed[start:end])
+            for day, totals in daily_totals(times[start:end], failed[start:end], restore_times, durations).items():
+                rollups.append(dict(zip(
+                    ("project_id", "environment", "day", "successes", "failures", "restores", "restore_seconds"),
+                    (project_id, environment, day, *totals)
+                )))
+            health_rows.append({
+                "project_id": project_id,
+                "environment": environment,
+                "last_status": DeploymentStatus.FAILED if failed[end - 1] else DeploymentStatus.SUCCESS,
+                "last_deployed_at": from_seconds(times[end - 1]),
+                "failing_since": None if np.isnan(failing_since) else from_seconds(failing_since),
+            })
+
+        await db.execute(insert(DeploymentDailyRollup), rollups)
+        await db.execute(insert(DeploymentEnvironmentHealth), health_rows)
+
+    return len(project_ids)
+
+
+def metrics(successes: int, failures: int, restores: int, restore_seconds: float, days: float) -> dict:
+    deployments = successes + failures
+    return {
+        "deployments": deployments,
+        "successes": successes,
+        "failures": failures,
+        "deployment_frequency_per_day": round(successes / days, 4) if days > 0 else None,
+        "change_failure_rate": round(failures / deployments, 4) if deployments else None,
+        "restores": restores,
+        "mean_time_to_restore_seconds": round(restore_seconds / restores, 1) if restores else None,
+    }
+
+
+async def _edge_totals(db: AsyncSession, project_id: int, start: datetime, end: datetime, environment: Optional[str]) -> dict:
+    """{environment: [successes, failures, restores, restore_seconds]} from raw deployments in [start, end)"""
+    stmt = (
+        select(Deployment.environment, Deployment.deployed_at, Deployment.status)
+        .where(
+            Deployment.project_id == project_id,
+            Deployment.deployed_at >= start,
+            Deployment.deployed_at < end,
+            Deployment.status != DeploymentStatus.PENDING,
+        )
+        .order_by(Deployment.environment, Deployment.deployed_at)
+    )
+    if environment is not None:
+        stmt = stmt.where(Deployment.environment == environment)
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return {}
+
+    # Failure streaks can start before the edge: find each streak start as of `start`
+    environments = sorted({row.environment for row in rows})
+    last_success, failure = aliased(Deployment), aliased(Deployment)
+    last_success_at = (
+        select(last_success.deployed_at)
+        .where(
+            last_success.project_id == project_id,
+            last_success.environment == DeploymentEnvironmentHealth.environment,
+            last_success.status == DeploymentStatus.SUCCESS,
+            last_success.deployed_at < start,
+        )
+        .order_by(last_success.deployed_at.desc())
+        .limit(1)
+        .correlate_except(last_success)
+        .scalar_subquery()
+    )
+    streak_start = (
+        select(func.min(failure.deployed_at))
+        .where(
+            failure.project_id == project_id,
+            failure.environment == DeploymentEnvironmentHealth.environment,
+            failure.status == DeploymentStatus.FAILED,
+            failure.deployed_at < start,
+            or_(last_success_at.is_(None), failure.deployed_at > last_success_at),
+        )
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(DeploymentEnvironmentHealth.environment, streak_start)
+        .where(
+            DeploymentEnvironmentHealth.project_id == project_id,
+            DeploymentEnvironmentHealth.environment.in_(environments),
+        )
+    )
+    failing_since = {env: to_seconds([since])[0] for env, since in result if since is not None}
+
+    environment_column = np.array([row.environment for row in rows], dtype=object)
+    times = to_seconds(row.deployed_at for row in rows)
+    failed = np.array([row.status == DeploymentStatus.FAILED for row in rows], dtype=bool)
+    boundaries = np.flatnonzero(environment_column[1:] != environment_column[:-1]) + 1
+
+    totals = {}
+    for first, last in zip(np.r_[0, boundaries], np.r_[boundaries, len(rows)]):
+        env = environment_column[first]
+        _, durations, _ = replay_restores(times[first:last], failed[first:last], failing_since.get(env, np.nan))
+        env_failures = int(failed[first:last].sum())
+        totals[env] = [int(last - first) - env_failures, env_failures, int(durations.size), float(durations.sum())]
+    return totals
+
+
+async def dora_metrics(db: AsyncSession, project_id: int, start: datetime, end: datetime, environment: Optional[str] = None) -> dict:
+    """DORA metrics per environment for deployments in [start, end) (naive UTC).
+
+    Whole UTC days come from the daily rollups; the partial days at either
+    edge of the window are computed from the raw deployments.
+    """
+    first_day = start.date() if start.time() == datetime.min.time() else start.date() + timedelta(days=1)
+    end_day = end.date()
+
+    edges = []
+    if first_day >= end_day:
+        edges.append((start, end))
+    else:
+        if start < datetime.combine(first_day, datetime.min.time()):
+            edges.append((start, datetime.combine(first_day, datetime.min.time())))
+        if datetime.combine(end_day, datetime.min.time()) < end:
+            edges.append((datetime.combine(end_day, datetime.min.time()), end))
+
+    environments, columns = [], []
+    if first_day < end_day:
+        stmt = select(
+            DeploymentDailyRollup.environment,
+            DeploymentDailyRollup.successes,
+            DeploymentDailyRollup.failures,
+            DeploymentDailyRollup.restores,
+            DeploymentDailyRollup.restore_seconds,
+        ).where(
+            DeploymentDailyRollup.project_id == project_id,
+            DeploymentDailyRollup.day >= first_day,
+            DeploymentDailyRollup.day < end_day,
+        )
+        if environment is not None:
+            stmt = stmt.where(DeploymentDailyRollup.environment == environment)
+        for row in await db.execute(stmt):
+            environments.append(row[0])
+            columns.append(row[1:])
+
+    for edge_start, edge_end in edges:
+        for env, totals in (await _edge_totals(db, project_id, edge_start, edge_end, environment)).items():
+            environments.append(env)
+            columns.append(totals)
+
+    days = (end - start).total_seconds() / DAY_SECONDS
+    by_environment = {}
+    overall = np.zeros(4)
+    if environments:
+        names, index = np.unique(np.array(environments, dtype=object), return_inverse=True)
+        values = np.array(columns, dtype=float)
+        sums = np.stack([np.bincount(index, weights=values[:, i], minlength=len(names)) for i in range(4)], axis=1)
+        by_environment = {
+            str(name): metrics(int(row[0]), int(row[1]), int(row[2]), float(row[3]), days)
+            for name, row in zip(names, sums)
+        }
+        overall = sums.sum(axis=0)
+
+    return {
+        "project_id": project_id,
+        "start": start,
+        "end": end,
+        "days": round(days, 4),
+        "overall": metrics(int(overall[0]), int(overall[1]), int(overall[2]), float(overall[3]), days),
+        "environments": by_environment,
+    }
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, String, column, insert, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.config import (
+    DEPLOYMENT_QUEUE_MAX_SIZE, DEPLOYMENT_BATCH_SIZE, DEPLOYMENT_FLUSH_INTERVAL_SECONDS,
+    DEPLOYMENT_FLUSH_RETRIES, DEPLOYMENT_RETRY_BACKOFF_SECONDS,
+)
+from app.db.database import async_session
+from app.models.deployment import Deployment, DeploymentStatus
+from app.models.project import Project
+from app.services.deployments.board import invalidate_environment_board
+from app.services.deployments.dora import record_outcomes
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class DeploymentEvent:
+    """One deployment report from CI, stamped when the API accepted it"""
+    project_id: int
+    deployed_by_id: Optional[int]
+    environment: str
+    version: str
+    status: DeploymentStatus
+    deployed_at: datetime
+
+    @property
+    def key(self) -> tuple:
+        return (self.project_id, self.environment, self.version)
+
+    def row(self) -> dict:
+        return {
+            "project_id": self.project_id,
+            "deployed_by_id": self.deployed_by_id,
+            "environment": self.environment,
+            "version": self.version,
+            "status": self.status,
+            "deployed_at": self.deployed_at,
+        }
+
+
+class DeploymentWriter:
+    """Buffers deployment events in memory and writes them in batches.
+
+    Requests only enqueue; a background task collects up to `batch_size`
+    events (or whatever arrived within `flush_interval`) and writes them in
+    one transaction: a multi-row INSERT for new deployments, then a single
+    UPDATE ... FROM (VALUES ...) that moves matching PENDING deployments to
+    SUCCESS or FAILED. A deployment is matched on (project, environment,
+    version). Finished deployments are folded into the DORA rollups in the
+    same transaction. When the queue is full callers get a 503.
+
+    The events were already acknowledged, so a failed batch is retried
+    `retries` times with exponential backoff (the transaction rolled back,
+    so replaying it is safe); after that its events are counted as `lost`.
+    """
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, session_factory=async_session,
+                 retries: int = DEPLOYMENT_FLUSH_RETRIES, retry_backoff: float = DEPLOYMENT_RETRY_BACKOFF_SECONDS):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self._queue = None
+        self._task = None
+        self.accepted = 0
+        self.rejected = 0
+        self.inserted = 0
+        self.transitioned = 0
+        self.dropped = 0
+        self.lost = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.retried_flushes = 0
+        self.total_flush_time = 0.0
+        self.max_batch = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._run(), name="deployment-writer")
+
+    async def stop(self) -> None:
+        """Write whatever is still queued, then stop the background task"""
+        if not self.running:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def submit(self, events: List[DeploymentEvent]) -> None:
+        """Enqueue all events or none of them"""
+        if not self.running or self.max_size - self._queue.qsize() < len(events):
+            self.rejected += len(events)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Deployment queue is full, retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        for event in events:
+            self._queue.put_nowait(event)
+        self.accepted += len(events)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await self._queue.get()
+            if event is _STOP:
+                return
+            batch = [event]
+            deadline = loop.time() + self.flush_interval
+            stopping = False
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: List[DeploymentEvent]) -> None:
+        started = time.perf_counter()
+        try:
+            for attempt in range(self.retries + 1):
+                if attempt:
+                    self.retried_flushes += 1
+                    await asyncio.sleep(self.retry_backoff * 2 ** (attempt - 1))
+                try:
+                    async with self.session_factory() as db:
+                        inserted, transitioned, skipped = await self.write(db, batch)
+                        await db.commit()
+                    break
+                except Exception:
+                    logger.warning("Failed to write %d deployment events (attempt %d of %d)",
+                                   len(batch), attempt + 1, self.retries + 1, exc_info=True)
+            else:
+                self.failed_flushes += 1
+                self.lost += len(batch)
+                logger.error("Giving up on %d deployment events", len(batch))
+                return
+            if inserted or transitioned:
+                invalidate_environment_board()
+            self.inserted += inserted
+            self.transitioned += transitioned
+            self.dropped += skipped
+        finally:
+            elapsed = time.perf_counter() - started
+            self.flushes += 1
+            self.total_flush_time += elapsed
+            self.max_batch = max(self.max_batch, len(batch))
+
+    async def write(self, db: AsyncSession, batch: List[DeploymentEvent]) -> tuple:
+        """Write one batch in the caller's transaction; returns (inserted, transitioned, skipped)"""
+        # Projects deleted since the events were accepted would fail the whole batch
+        result = await db.execute(select(Project.id).where(Project.id.in_({event.project_id for event in batch})))
+        existing = set(result.scalars().all())
+        valid = [event for event in batch if event.project_id in existing]
+        skipped = len(batch) - len(valid)
+
+        started = [event for event in valid if event.status == DeploymentStatus.PENDING]
+        # Last report wins when a runner sends the same outcome twice
+        finished = {event.key: event for event in valid if event.status != DeploymentStatus.PENDING}
+
+        if started:
+            await db.execute(insert(Deployment).values([event.row() for event in started]))
+
+        transitions, unmatched = [], []
+        if finished:
+            outcomes = values(
+                column("project_id", Integer),
+                column("environment", String),
+                column("version", String),
+                column("status", Deployment.__table__.c.status.type),
+                name="outcomes",
+            ).data([(*key, event.status) for key, event in finished.items()])
+            result = await db.execute(
+                update(Deployment)
+                .where(
+                    Deployment.project_id == outcomes.c.project_id,
+                    Deployment.environment == outcomes.c.environment,
+                    Deployment.version == outcomes.c.version,
+                    Deployment.status == DeploymentStatus.PENDING,
+                )
+                .values(status=outcomes.c.status)
+                .returning(
+                    Deployment.project_id, Deployment.environment, Deployment.version,
+                    Deployment.status, Deployment.deployed_at
+                )
+                .execution_options(synchronize_session=False)
+            )
+            transitions = result.all()
+            matched = {(row.project_id, row.environment, row.version) for row in transitions}
+            # Outcomes without a PENDING deployment are reported as finished deployments
+            unmatched = [event for key, event in finished.items() if key not in matched]
+            if unmatched:
+                await db.execute(insert(Deployment).values([event.row() for event in unmatched]))
+
+            await record_outcomes(db, [
+                (row.project_id, row.environment, row.status, row.deployed_at) for row in transitions
+            ] + [
+                (event.project_id, event.environment, event.status, event.deployed_at) for event in unmatched
+            ])
+
+        return len(started) + len(unmatched), len(transitions), skipped
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "inserted": self.inserted,
+            "transitioned": self.transitioned,
+            "dropped": self.dropped,
+            "lost": self.lost,
+            "flushes": self.flushes,
+            "retried_flushes": self.retried_flushes,
+            "failed_flushes": self.failed_flushes,
+            "avg_flush_ms": round(self.total_flush_time / self.flushes * 1000, 2) if self.flushes else None,
+            "max_batch": self.max_batch,
+        }
+
+
+deployment_writer = DeploymentWriter(DEPLOYMENT_QUEUE_MAX_SIZE, DEPLOYMENT_BATCH_SIZE, DEPLOYMENT_FLUSH_INTERVAL_SECONDS)
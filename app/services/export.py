@@ -0,0 +1,59 @@
+import json
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator
+from sqlalchemy.future import select
+from app.models.task import Task
+from app.models.activity import TaskActivity
+from app.models.project_feedback import ProjectFeedback
+from app.models.ai_generation import AIGeneration
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _export_sections(project_id: int):
+    project_task_ids = select(Task.id).where(Task.project_id == project_id)
+    return [
+        ("task", select(Task.__table__).where(Task.project_id == project_id).order_by(Task.id)),
+        ("task_activity", select(TaskActivity.__table__).where(TaskActivity.task_id.in_(project_task_ids)).order_by(TaskActivity.id)),
+        ("project_feedback", select(ProjectFeedback.__table__).where(ProjectFeedback.project_id == project_id).order_by(ProjectFeedback.id)),
+        ("ai_generation", select(AIGeneration.__table__).where(AIGeneration.project_id == project_id).order_by(AIGeneration.id)),
+    ]
+
+
+async def export_project_ndjson(project_id: int, session_factory) -> AsyncIterator[bytes]:
+    """Yield a project's audit records as NDJSON, one `{"type", "data"}` object per line.
+
+    Rows are read as plain tuples through server-side cursors, one batch at a
+    time, so memory stays flat however large the project is. All sections are
+    read from one REPEATABLE READ snapshot.
+    """
+    async with session_factory() as session:
+        await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        for record_type, stmt in _export_sections(project_id):
+            result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                yield "".join(
+                    json.dumps({"type": record_type, "data": dict(row._mapping)}, default=_json_default) + "\n"
+                    for row in rows
+                ).encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a gzip file on the fly"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,296 @@
+import csv
+import json
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterable, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.models.task import Task, TaskStatus, AssignmentStatus
+from app.models.activity import TaskActivity
+from app.models.project import Project
+from app.models.user import User
+from app.services.partitions import ensure_month_partitions
+from app.services.task_stats import rebuild_task_stats
+
+IMPORT_BATCH_SIZE = 5000
+# Records read and validated per call of `parse_records`, e.g. per threadpool hop
+PARSE_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+TASK_COLUMNS = ("title", "description", "status", "project_id", "creator_id", "assignee_id", "assignment_status", "working_user_id")
+ACTIVITY_COLUMNS = ("task_id", "user_id", "action", "details", "created_at")
+
+# Record types accepted in NDJSON input, matching the project export format
+RECORD_TABLES = {"task": "tasks", "tasks": "tasks", "task_activity": "task_activities", "task_activities": "task_activities"}
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Tuple[int, Optional[str], dict]]:
+    """Yield (line number, table, fields) from NDJSON lines.
+
+    Each line is either `{"type": ..., "data": {...}}` (the export format) or
+    a flat object with a `type` key.
+    """
+    for line_no, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, {"error": f"Invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, {"error": "Expected a JSON object"}
+            continue
+        data = record.get("data", record)
+        yield line_no, RECORD_TABLES.get(record.get("type")), data
+
+
+def read_csv(lines: Iterable[str], table: str) -> Iterator[Tuple[int, Optional[str], dict]]:
+    """Yield (line number, table, fields) from a CSV file with a header row; empty cells are NULL"""
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, table, {key: (value if value != "" else None) for key, value in row.items()}
+
+
+def _int(data: dict, field: str, required: bool = False) -> Optional[int]:
+    value = data.get(field)
+    if value is None:
+        if required:
+            raise ValueError(f"{field} is required")
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be an integer")
+
+
+def _text(data: dict, field: str, max_length: Optional[int] = None, required: bool = False) -> Optional[str]:
+    value = data.get(field)
+    if value is None or (required and not str(value).strip()):
+        if required:
+            raise ValueError(f"{field} is required")
+        return None
+    value = str(value)
+    if max_length and len(value) > max_length:
+        raise ValueError(f"{field} must be at most {max_length} characters")
+    return value
+
+
+def _enum_label(data: dict, field: str, enum_cls) -> Optional[str]:
+    """Database label (the member name) for an enum given by value or name"""
+    value = data.get(field)
+    if value is None:
+        return None
+    for member in enum_cls:
+        if value in (member.value, member.name):
+            return member.name
+    raise ValueError(f"{field} must be one of {', '.join(member.value for member in enum_cls)}")
+
+
+def _timestamp(data: dict, field: str) -> datetime:
+    value = data.get(field)
+    if value is None:
+        return datetime.utcnow()
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        raise ValueError(f"{field} must be an ISO 8601 timestamp")
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def parse_task(data: dict) -> tuple:
+    return (
+        _text(data, "title", Task.__table__.c.title.type.length, required=True),
+        _text(data, "description"),
+        _enum_label(data, "status", TaskStatus) or TaskStatus.TODO.name,
+        _int(data, "project_id", required=True),
+        _int(data, "creator_id", required=True),
+        _int(data, "assignee_id"),
+        _enum_label(data, "assignment_status", AssignmentStatus),
+        _int(data, "working_user_id"),
+    )
+
+
+def parse_activity(data: dict) -> tuple:
+    return (
+        _int(data, "task_id", required=True),
+        _int(data, "user_id", required=True),
+        _text(data, "action", TaskActivity.__table__.c.action.type.length, required=True),
+        _text(data, "details"),
+        _timestamp(data, "created_at"),
+    )
+
+
+def parse_records(records: Iterable[Tuple[int, Optional[str], dict]], chunk_size: int = PARSE_CHUNK_SIZE) -> Iterator[List[tuple]]:
+    """Validate records, yielding lists of (line number, table, id, values).
+
+    Rejected records have table None and the error message as values. This
+    only reads and parses, so it can run in a worker thread.
+    """
+    chunk = []
+    for line_no, table, data in records:
+        if table is None:
+            chunk.append((line_no, None, None, data.get("error", "Unknown record type")))
+        else:
+            try:
+                values = parse_task(data) if table == "tasks" else parse_activity(data)
+                chunk.append((line_no, table, _int(data, "id"), values))
+            except ValueError as e:
+                chunk.append((line_no, None, None, str(e)))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ImportReport:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.imported = {"tasks": 0, "task_activities": 0}
+        self.rejected = 0
+        self.errors = []
+
+    def reject(self, line_no: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line_no, "error": message})
+
+    def as_dict(self) -> dict:
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        total = sum(self.imported.values())
+        return {
+            "imported": dict(self.imported),
+            "rejected": self.rejected,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(total / elapsed) if elapsed > 0 else None,
+            "errors": self.errors,
+        }
+
+
+class TaskImporter:
+    """Validates records in batches and writes them with asyncpg binary COPY.
+
+    Everything runs in the caller's transaction: commit the session after
+    `finish()` to keep the import, or roll back to discard it.
+    """
+
+    def __init__(self, session: AsyncSession, batch_size: int = IMPORT_BATCH_SIZE):
+        self.session = session
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self.pending = {"tasks": [], "task_activities": []}
+        self.explicit_ids = set()
+        self.project_ids = set()
+        self._driver = None
+
+    async def add(self, chunk: List[tuple]) -> None:
+        """Queue a chunk from `parse_records`, writing every full batch"""
+        for line_no, table, record_id, values in chunk:
+            if table is None:
+                self.report.reject(line_no, values)
+                continue
+            self.pending[table].append((line_no, record_id, values))
+            if len(self.pending[table]) >= self.batch_size:
+                await self.flush()
+
+    async def import_records(self, records: Iterable[Tuple[int, Optional[str], dict]]) -> dict:
+        """Import records read and parsed on the event loop; fine for scripts"""
+        for chunk in parse_records(records):
+            await self.add(chunk)
+        return await self.finish()
+
+    async def import_chunks(self, chunks: AsyncIterable[List[tuple]]) -> dict:
+        """Import chunks from `parse_records` produced elsewhere, e.g. by `iterate_in_threadpool`"""
+        async for chunk in chunks:
+            await self.add(chunk)
+        return await self.finish()
+
+    async def flush(self) -> None:
+        # Tasks first so activities in the same batch can reference them
+        tasks, self.pending["tasks"] = self.pending["tasks"], []
+        if tasks:
+            tasks = await self._check_references(tasks, "tasks", {
+                3: (Project, "project"), 4: (User, "creator"), 5: (User, "assignee"), 7: (User, "working user"),
+            })
+            await self._copy("tasks", TASK_COLUMNS, tasks)
+            self.project_ids.update(values[3] for _, _, values in tasks)
+
+        activities, self.pending["task_activities"] = self.pending["task_activities"], []
+        if activities:
+            activities = await self._check_references(activities, "task_activities", {
+                0: (Task, "task"), 1: (User, "user"),
+            })
+            # task_activities has no default partition; historic rows need theirs
+            await ensure_month_partitions(self.session, {values[4] for _, _, values in activities})
+            await self._copy("task_activities", ACTIVITY_COLUMNS, activities)
+
+    async def finish(self) -> dict:
+        await self.flush()
+        # Explicit ids bypass the sequences; move them past the imported rows
+        for table in self.explicit_ids:
+            await self.session.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT max(id) FROM {table}))"
+            ))
+        # COPY bypasses the per-request stats deltas
+        await rebuild_task_stats(self.session, self.project_ids)
+        self.report.finished = time.perf_counter()
+        return self.report.as_dict()
+
+    async def _check_references(self, batch: list, table: str, references: dict) -> list:
+        """Drop rows whose foreign keys or explicit ids do not fit, with one query per referenced table"""
+        existing = {}
+        for model in {model for model, _ in references.values()}:
+            ids = {values[position] for _, _, values in batch for position, (ref, _) in references.items() if ref is model}
+            ids.discard(None)
+            if ids:
+                result = await self.session.execute(select(model.id).where(model.id.in_(ids)))
+                existing[model] = set(result.scalars().all())
+
+        model = Task if table == "tasks" else TaskActivity
+        explicit = {record_id for _, record_id, _ in batch if record_id is not None}
+        taken = set()
+        if explicit:
+            result = await self.session.execute(select(model.id).where(model.id.in_(explicit)))
+            taken = set(result.scalars().all())
+
+        valid = []
+        for line_no, record_id, values in batch:
+            missing = [
+                f"{label} {values[position]} not found"
+                for position, (ref, label) in references.items()
+                if values[position] is not None and values[position] not in existing.get(ref, ())
+            ]
+            if record_id is not None and record_id in taken:
+                missing.append(f"id {record_id} already exists")
+            if missing:
+                self.report.reject(line_no, "; ".join(missing))
+                continue
+            if record_id is not None:
+                taken.add(record_id)
+            valid.append((line_no, record_id, values))
+        return valid
+
+    async def _copy(self, table: str, columns: tuple, batch: list) -> None:
+        driver = await self._driver_connection()
+        with_ids = [(record_id,) + values for _, record_id, values in batch if record_id is not None]
+        without_ids = [values for _, record_id, values in batch if record_id is None]
+        if with_ids:
+            await driver.copy_records_to_table(table, records=with_ids, columns=("id",) + columns)
+            self.explicit_ids.add(table)
+        if without_ids:
+            await driver.copy_records_to_table(table, records=without_ids, columns=columns)
+        self.report.imported[table] += len(batch)
+
+    async def _driver_connection(self):
+        if self._driver is None:
+            connection = await self.session.connection()
+            # Make sure the transaction is open before going around SQLAlchemy
+            await connection.execute(text("SELECT 1"))
+            raw = await connection.get_raw_connection()
+            self._driver = raw.driver_connection
+        return self._driver
@@ -0,0 +1,105 @@
+import json
+from typing import FrozenSet, Iterable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.core.cache import TTLCache
+from app.core.config import MEMBERSHIP_CACHE_TTL_SECONDS, MEMBERSHIP_CACHE_MAX_SIZE, MEMBERSHIP_CACHE_REDIS_URL
+from app.models.project_students import project_students
+from app.models.project_supervisors import project_supervisors
+from app.models.user import User
+
+# Membership table (member column, project column) for each user role
+MEMBERSHIP_COLUMNS = {
+    "student": (project_students.c.student_id, project_students.c.project_id),
+    "supervisor": (project_supervisors.c.supervisor_id, project_supervisors.c.project_id),
+}
+
+
+class MembershipCache:
+    """Project ids each user belongs to, per role, for permission checks.
+
+    Entries live in this worker's TTLCache, or in Redis when `redis_url` is
+    set so every worker sees an invalidation immediately. Member add and
+    remove endpoints must call `invalidate()` after committing.
+    """
+
+    def __init__(self, max_size: int, ttl: float, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._local = TTLCache(max_size=max_size, ttl=ttl)
+        self._redis = None
+        # Bumped on every invalidation; a load that raced with one is not stored
+        self._generation = 0
+        if redis_url:
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("MEMBERSHIP_CACHE_REDIS_URL is set but the redis package is not installed")
+            self._redis = redis.from_url(redis_url)
+
+    @staticmethod
+    def key(user_id: int, role: str) -> str:
+        return f"membership:{role}:{user_id}"
+
+    async def _get(self, key: str) -> Optional[FrozenSet[int]]:
+        if self._redis is None:
+            return self._local.get(key)
+        raw = await self._redis.get(key)
+        return frozenset(json.loads(raw)) if raw is not None else None
+
+    async def _set(self, key: str, project_ids: FrozenSet[int]) -> None:
+        if self._redis is None:
+            self._local.set(key, project_ids)
+        else:
+            await self._redis.set(key, json.dumps(sorted(project_ids)), ex=max(1, int(self.ttl)))
+
+    async def project_ids(self, user: User, db: AsyncSession) -> FrozenSet[int]:
+        """Projects the user is a member of through their role; one query on a miss"""
+        columns = MEMBERSHIP_COLUMNS.get(user.role)
+        if columns is None:
+            return frozenset()
+
+        key = self.key(user.id, user.role)
+        cached = await self._get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        generation = self._generation
+        member_column, project_column = columns
+        result = await db.execute(select(project_column).where(member_column == user.id))
+        project_ids = frozenset(result.scalars().all())
+        if generation == self._generation:
+            await self._set(key, project_ids)
+        return project_ids
+
+    async def invalidate(self, user_ids: Iterable[int]) -> None:
+        keys = [self.key(user_id, role) for user_id in user_ids for role in MEMBERSHIP_COLUMNS]
+        if not keys:
+            return
+        self._generation += 1
+        self.invalidations += 1
+        if self._redis is None:
+            for key in keys:
+                self._local.invalidate(key)
+        else:
+            await self._redis.delete(*keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        stats = {
+            "backend": "redis" if self._redis is not None else "local",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+        if self._redis is None:
+            stats.update(size=self._local.stats()["size"], max_size=self._local.max_size)
+        return stats
+
+
+membership_cache = MembershipCache(MEMBERSHIP_CACHE_MAX_SIZE, MEMBERSHIP_CACHE_TTL_SECONDS, MEMBERSHIP_CACHE_REDIS_URL)
@@ -0,0 +1,101 @@
+import gzip
+import os
+import re
+from datetime import date
+from typing import Iterable, List, Union
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+PARENT_TABLE = "task_activities"
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year}m{month.month:02d}"
+
+
+async def list_partitions(db: Union[AsyncSession, AsyncConnection]) -> List[date]:
+    """Months that currently have an attached task_activities partition, oldest first"""
+    result = await db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE pg_inherits.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT_TABLE})
+    months = []
+    for name in result.scalars():
+        match = _PARTITION_NAME.match(name)
+        if match:
+            months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+async def ensure_month_partitions(db: AsyncSession, months: Iterable[date]) -> List[date]:
+    """Create the monthly partitions covering `months` if they are missing"""
+    # Workers starting up and the maintenance job may race to create the same month
+    await db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:parent))"), {"parent": PARENT_TABLE})
+    existing = set(await list_partitions(db))
+    created = []
+    for month in sorted({month_start(month) for month in months} - existing):
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT_TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        ))
+        created.append(month)
+    return created
+
+
+async def create_future_partitions(db: AsyncSession, months_ahead: int, today: date = None) -> List[date]:
+    current = month_start(today or date.today())
+    return await ensure_month_partitions(db, (add_months(current, offset) for offset in range(months_ahead + 1)))
+
+
+async def archive_old_partitions(engine: AsyncEngine, retention_months: int, archive_dir: str, today: date = None) -> List[str]:
+    """Dump partitions older than the retention window to gzip CSV, then detach and drop them.
+
+    Every step is its own short autocommit statement, so the parent table is
+    never locked while a month is being copied: the copy only reads the
+    partition, DETACH ... CONCURRENTLY waits for running queries instead of
+    blocking new ones, and the DROP only touches the detached table. A
+    failed run leaves the partition attached (or pending detach, which the
+    next run finalizes) and simply archives it again.
+    """
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    os.makedirs(archive_dir, exist_ok=True)
+    archived = []
+
+    async with engine.connect() as connection:
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        driver = (await connection.get_raw_connection()).driver_connection
+        result = await connection.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = CAST(:parent AS regclass) AND pg_inherits.inhdetachpending"
+        ), {"parent": PARENT_TABLE})
+        detach_pending = set(result.scalars())
+
+        for month in await list_partitions(connection):
+            if month >= cutoff:
+                break
+            name = partition_name(month)
+
+            path = os.path.join(archive_dir, f"{name}.csv.gz")
+            with gzip.open(path + ".tmp", "wb") as archive:
+                await driver.copy_from_table(name, output=archive, format="csv", header=True)
+            os.replace(path + ".tmp", path)
+
+            # Cannot run inside a transaction block
+            mode = "FINALIZE" if name in detach_pending else "CONCURRENTLY"
+            await connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name} {mode}"))
+            await connection.execute(text(f"DROP TABLE {name}"))
+            archived.append(path)
+
+    return archived
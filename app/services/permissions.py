@@ -1,101 +1,123 @@
+from enum import Enum as PyEnum
+from typing import Iterable, Set
 from app.models.project import Project
 from app.models.user import User
+from app.services.membership_cache import MEMBERSHIP_COLUMNS, membership_cache
+from sqlalchemy import or_, true, union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
 
+class Membership(PyEnum):
+    """A user's effective relationship to a project, strongest first"""
+    ADMIN = "admin"
+    OWNER = "owner"
+    SUPERVISOR = "supervisor"
+    STUDENT = "student"
+    PUBLIC = "public"   # not a member, but the project is public
+    NONE = "none"
+
+
+# Membership granted by belonging to a project, for each user role
+ROLE_MEMBERSHIPS = {
+    "student": Membership.STUDENT,
+    "supervisor": Membership.SUPERVISOR,
+}
+
+MODIFY_MEMBERSHIPS = {Membership.ADMIN, Membership.OWNER, Membership.SUPERVISOR}
+CONTRIBUTE_MEMBERSHIPS = {Membership.ADMIN, Membership.OWNER, Membership.SUPERVISOR, Membership.STUDENT}
+
+
 class PermissionService:
     """Handles group-based project permissions"""
 
+    @staticmethod
+    async def resolve_membership(user: User, project: Project, db: AsyncSession) -> Membership:
+        """Resolve the user's relationship to a project, usually without a query.
+
+        Admin and owner come from the loaded rows; students and supervisors
+        are checked against the user's cached membership set, loaded with
+        one query on a miss. The result is also memoized on the session,
+        which lives for one request.
+        """
+        memo = db.info.setdefault("project_memberships", {})
+        key = (user.id, project.id)
+        if key in memo:
+            return memo[key]
+
+        if user.role == "admin":
+            membership = Membership.ADMIN
+        elif project.owner_id == user.id:
+            membership = Membership.OWNER
+        else:
+            membership = Membership.NONE
+            if user.role in ROLE_MEMBERSHIPS and project.id in await membership_cache.project_ids(user, db):
+                membership = ROLE_MEMBERSHIPS[user.role]
+            if membership == Membership.NONE and project.is_public:
+                membership = Membership.PUBLIC
+
+        memo[key] = membership
+        return membership
+
+    @staticmethod
+    async def memberships_changed(db: AsyncSession, user_ids: Iterable[int]) -> None:
+        """Forget cached memberships of these users; call after committing member changes"""
+        db.info.pop("project_memberships", None)
+        await membership_cache.invalidate(user_ids)
+
+    @staticmethod
+    def visibility_clause(user: User, include_public: bool = True):
+        """WHERE clause on Project matching what `can_access_project` allows.
+
+        With `include_public=False` it matches only projects the user owns or
+        belongs to. Membership is an IN over the owner index and the user's
+        membership table, so it is planned once rather than per project.
+        """
+        if user.role == "admin" and include_public:
+            return true()
+
+        member_ids = select(Project.id).where(Project.owner_id == user.id)
+        if user.role in MEMBERSHIP_COLUMNS:
+            member_column, project_column = MEMBERSHIP_COLUMNS[user.role]
+            member_ids = union(member_ids, select(project_column).where(member_column == user.id))
+        clause = Project.id.in_(member_ids)
+        return or_(Project.is_public.is_(True), clause) if include_public else clause
+
+    @staticmethod
+    async def can_access_projects(user: User, project_ids: Iterable[int], db: AsyncSession) -> Set[int]:
+        """The subset of `project_ids` the user can access, in one query"""
+        project_ids = set(project_ids)
+        if not project_ids:
+            return set()
+        result = await db.execute(
+            select(Project.id).where(Project.id.in_(project_ids), PermissionService.visibility_clause(user))
+        )
+        return set(result.scalars().all())
+
     @staticmethod
     async def can_access_project(user: User, project: Project, db: AsyncSession) -> bool:
         """Check if user can access a project"""
-        # Admin has full access
-        if user.role == "admin":
-            return True
-        
-        # Owner has full access
-        if project.owner_id == user.id:
-            return True
-        
-        # Check if user is a student in this project
-        if user.role == "student":
-            result = await db.execute(
-                select(Project).where(
-                    Project.id == project.id
-                ).join(Project.students).where(User.id == user.id)
-            )
-            if result.scalar_one_or_none():
-                return True
-        
-        # Check if user is a supervisor for this project
-        if user.role == "supervisor":
-            result = await db.execute(
-                select(Project).where(
-                    Project.id == project.id
-                ).join(Project.supervisors).where(User.id == user.id)
-            )
-            if result.scalar_one_or_none():
-                return True
-        
-        # Public projects are viewable by all
-        if project.is_public:
-            return True
-        
-        return False
+        # Admins, owners, members, and anyone for public projects
+        membership = await PermissionService.resolve_membership(user, project, db)
+        return membership != Membership.NONE
 
     @staticmethod
     async def can_modify_project(user: User, project: Project, db: AsyncSession) -> bool:
         """Check if user can modify a project"""
-        # Admin has full control
-        if user.role == "admin":
-            return True
-        
-        # Owner can modify
-        if project.owner_id == user.id:
-            return True
-        
-        # Supervisors can modify
-        if user.role == "supervisor":
-            result = await db.execute(
-                select(Project).where(
-                    Project.id == project.id
-                ).join(Project.supervisors).where(User.id == user.id)
-            )
-            if result.scalar_one_or_none():
-                return True
-        
-        return False
+        # Admins, owners and the project's supervisors
+        membership = await PermissionService.resolve_membership(user, project, db)
+        return membership in MODIFY_MEMBERSHIPS
 
     @staticmethod
     async def can_generate_cicd(user: User, project: Project, db: AsyncSession) -> bool:
         """Check if user can trigger AI generation for a project"""
-        # Admin can always generate
-        if user.role == "admin":
-            return True
-        
-        # Owner can generate
-        if project.owner_id == user.id:
-            return True
-        
-        # Students in the project can generate
-        if user.role == "student":
-            result = await db.execute(
-                select(Project).where(
-                    Project.id == project.id
-                ).join(Project.students).where(User.id == user.id)
-            )
-            if result.scalar_one_or_none():
-                return True
-        
-        # Supervisors can generate
-        if user.role == "supervisor":
-            result = await db.execute(
-                select(Project).where(
-                    Project.id == project.id
-                ).join(Project.supervisors).where(User.id == user.id)
-            )
-            if result.scalar_one_or_none():
-                return True
-        
-        return False
+        # Admins, owners, and the project's students and supervisors
+        membership = await PermissionService.resolve_membership(user, project, db)
+        return membership in CONTRIBUTE_MEMBERSHIPS
+
+    @staticmethod
+    async def can_report_deployments(user: User, project: Project, db: AsyncSession) -> bool:
+        """Check if user can report deployments for a project"""
+        # Same audience as AI generation: admins, owners, students and supervisors
+        membership = await PermissionService.resolve_membership(user, project, db)
+        return membership in CONTRIBUTE_MEMBERSHIPS
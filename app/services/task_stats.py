@@ -0,0 +1,98 @@
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.models.project import Project
+from app.models.project_task_stats import ProjectTaskStats
+from app.models.task import Task, TaskStatus, AssignmentStatus
+
+STATUS_COLUMNS = {
+    TaskStatus.TODO: "todo",
+    TaskStatus.IN_PROGRESS: "in_progress",
+    TaskStatus.DONE: "done",
+}
+ASSIGNMENT_COLUMNS = {
+    None: "unassigned",
+    AssignmentStatus.PENDING: "assignment_pending",
+    AssignmentStatus.ACCEPTED: "assignment_accepted",
+    AssignmentStatus.REJECTED: "assignment_rejected",
+}
+COUNT_COLUMNS = ("total",) + tuple(STATUS_COLUMNS.values()) + tuple(ASSIGNMENT_COLUMNS.values())
+
+
+class TaskStatsDelta:
+    """Collects count changes for project_task_stats during one request.
+
+    `apply()` writes them as a single upsert that adds the deltas, so it is
+    safe under concurrent writers and must run before the caller commits.
+    """
+
+    def __init__(self):
+        self._deltas = defaultdict(Counter)
+
+    def add(self, project_id: int, status: Optional[TaskStatus], assignment_status: Optional[AssignmentStatus], sign: int = 1) -> None:
+        delta = self._deltas[project_id]
+        delta["total"] += sign
+        delta[STATUS_COLUMNS[status or TaskStatus.TODO]] += sign
+        delta[ASSIGNMENT_COLUMNS[assignment_status]] += sign
+
+    def remove(self, project_id: int, status: Optional[TaskStatus], assignment_status: Optional[AssignmentStatus]) -> None:
+        self.add(project_id, status, assignment_status, sign=-1)
+
+    def change(self, project_id: int, old: tuple, new: tuple) -> None:
+        """Move one task from the old (status, assignment_status) to the new one"""
+        if old != new:
+            self.remove(project_id, *old)
+            self.add(project_id, *new)
+
+    async def apply(self, db: AsyncSession) -> None:
+        rows = [
+            {"project_id": project_id, **{column: delta[column] for column in COUNT_COLUMNS}}
+            for project_id, delta in sorted(self._deltas.items())
+            if any(delta.values())
+        ]
+        self._deltas.clear()
+        if not rows:
+            return
+
+        stmt = insert(ProjectTaskStats).values(rows)
+        table = ProjectTaskStats.__table__
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.project_id],
+            set_={
+                **{column: table.c[column] + stmt.excluded[column] for column in COUNT_COLUMNS},
+                "updated_at": func.now(),
+            }
+        ))
+
+
+async def rebuild_task_stats(db: AsyncSession, project_ids: Optional[Iterable[int]] = None) -> int:
+    """Recount project_task_stats from the tasks table to repair drift; returns projects rebuilt"""
+    counts = [func.count(Task.id).label("total")]
+    for status, column in STATUS_COLUMNS.items():
+        condition = Task.status == status
+        if status == TaskStatus.TODO:
+            condition = or_(condition, Task.status.is_(None))
+        counts.append(func.count(Task.id).filter(condition).label(column))
+    for assignment_status, column in ASSIGNMENT_COLUMNS.items():
+        condition = Task.assignment_status.is_(None) if assignment_status is None else Task.assignment_status == assignment_status
+        counts.append(func.count(Task.id).filter(condition).label(column))
+
+    source = select(Project.id.label("project_id"), *counts).outerjoin(Task, Task.project_id == Project.id).group_by(Project.id)
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return 0
+        source = source.where(Project.id.in_(project_ids))
+
+    stmt = insert(ProjectTaskStats).from_select(("project_id",) + COUNT_COLUMNS, source)
+    result = await db.execute(stmt.on_conflict_do_update(
+        index_elements=[ProjectTaskStats.__table__.c.project_id],
+        set_={
+            **{column: stmt.excluded[column] for column in COUNT_COLUMNS},
+            "updated_at": func.now(),
+        }
+    ))
+    return result.rowcount
@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from app.models.deployment import DeploymentStatus
+from app.services.deployments.writer import DeploymentEvent, DeploymentWriter
+
+
+class FakeSession:
+    async def commit(self):
+        pass
+
+
+@asynccontextmanager
+async def fake_session():
+    yield FakeSession()
+
+
+def flaky_writer(failures: int, retries: int) -> DeploymentWriter:
+    writer = DeploymentWriter(100, 10, 0.01, session_factory=fake_session, retries=retries, retry_backoff=0)
+    calls = {"count": 0}
+
+    async def write(db, batch):
+        calls["count"] += 1
+        if calls["count"] <= failures:
+            raise ConnectionError("database unavailable")
+        return len(batch), 0, 0
+
+    writer.write = write
+    return writer
+
+
+def events(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [DeploymentEvent(1, None, "prod", f"v{i}", DeploymentStatus.PENDING, now) for i in range(count)]
+
+
+def test_failed_batch_is_retried():
+    writer = flaky_writer(failures=2, retries=3)
+    asyncio.run(writer._flush(events(3)))
+    stats = writer.stats()
+    assert stats["inserted"] == 3
+    assert stats["retried_flushes"] == 2
+    assert stats["lost"] == 0
+    assert stats["failed_flushes"] == 0
+
+
+def test_events_are_counted_as_lost_once_retries_run_out():
+    writer = flaky_writer(failures=10, retries=1)
+    asyncio.run(writer._flush(events(3)))
+    stats = writer.stats()
+    assert stats["inserted"] == 0
+    assert stats["retried_flushes"] == 1
+    assert stats["lost"] == 3
+    assert stats["failed_flushes"] == 1
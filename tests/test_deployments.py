@@ -0,0 +1,26 @@
+from app.db.database import async_session
+from app.services.deployments.board import (
+    BOARD_KEY, environment_board, environment_board_cache, invalidate_environment_board,
+)
+
+
+def test_board_refill_racing_an_invalidation_is_not_cached(run):
+    async def scenario():
+        environment_board_cache.clear()
+        async with async_session() as db:
+            execute = db.execute
+
+            async def racing_execute(*args, **kwargs):
+                # The writer commits and invalidates while the board query runs
+                invalidate_environment_board()
+                return await execute(*args, **kwargs)
+
+            db.execute = racing_execute
+            assert await environment_board(db) == []
+            assert environment_board_cache.get(BOARD_KEY) is None
+
+            db.execute = execute
+            await environment_board(db)
+            assert environment_board_cache.get(BOARD_KEY) == []
+
+    run(scenario())
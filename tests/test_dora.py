@@ -0,0 +1,127 @@
+import random
+from datetime import date, datetime, timedelta
+import numpy as np
+from sqlalchemy.future import select
+from app.db.database import async_session
+from app.models.deployment import Deployment, DeploymentStatus
+from app.services.deployments.dora import (
+    DAY_SECONDS, daily_totals, metrics, rebuild_dora_rollups, replay_restores,
+)
+from app.services.deployments.writer import DeploymentEvent, deployment_writer
+from tests.conftest import auth, client, create_project, create_user
+
+
+def replay(times, failed, failing_since=np.nan):
+    return replay_restores(np.array(times, dtype=float), np.array(failed, dtype=bool), failing_since)
+
+
+def test_failure_streak_ending_in_a_success():
+    restore_times, durations, failing_since = replay([0, 10, 20, 30, 40], [False, True, True, False, False])
+    assert restore_times.tolist() == [30]
+    assert durations.tolist() == [20]
+    assert np.isnan(failing_since)
+
+
+def test_streak_still_open_at_the_window_edge():
+    # Open at the end: reported as failing since the first failure
+    restore_times, durations, failing_since = replay([0, 10, 20], [False, True, True])
+    assert durations.size == 0
+    assert failing_since == 10
+
+    # Open before the start: the first success restores it
+    restore_times, durations, failing_since = replay([50, 60, 70], [True, False, True], failing_since=-100)
+    assert restore_times.tolist() == [60]
+    assert durations.tolist() == [160]
+    assert failing_since == 70
+
+
+def test_empty_input():
+    restore_times, durations, failing_since = replay([], [], failing_since=5.0)
+    assert restore_times.size == 0 and durations.size == 0
+    assert failing_since == 5.0
+    assert daily_totals(np.empty(0), np.empty(0, dtype=bool), np.empty(0), np.empty(0)) == {}
+
+
+def test_daily_totals_split_on_utc_days():
+    # A failure just before midnight restored just after it
+    times = np.array([DAY_SECONDS - 10, DAY_SECONDS + 5, 2 * DAY_SECONDS + 1], dtype=float)
+    failed = np.array([True, False, False])
+    restore_times, durations, _ = replay_restores(times, failed)
+    assert daily_totals(times, failed, restore_times, durations) == {
+        date(1970, 1, 1): [0, 1, 0, 0.0],
+        date(1970, 1, 2): [1, 0, 1, 15.0],
+        date(1970, 1, 3): [1, 0, 0, 0.0],
+    }
+
+
+def raw_scan(rows, start: datetime, end: datetime) -> dict:
+    """DORA totals per environment, straight from every deployment in time order"""
+    days = (end - start).total_seconds() / DAY_SECONDS
+    totals = {}
+    for environment in sorted({row.environment for row in rows}):
+        successes = failures = restores = 0
+        restore_seconds, failing_since = 0.0, None
+        for row in sorted((row for row in rows if row.environment == environment), key=lambda row: row.deployed_at):
+            in_window = start <= row.deployed_at < end
+            if row.status == DeploymentStatus.FAILED:
+                failures += in_window
+                failing_since = failing_since or row.deployed_at
+                continue
+            if in_window:
+                successes += 1
+                if failing_since is not None:
+                    restores += 1
+                    restore_seconds += (row.deployed_at - failing_since).total_seconds()
+            failing_since = None
+        if successes or failures:
+            totals[environment] = metrics(successes, failures, restores, restore_seconds, days)
+    return totals
+
+
+def test_dora_from_rollups_matches_a_raw_scan(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            project, _ = await create_project(db, owner)
+            await db.commit()
+
+        # Four days of outcomes, written in time order through the deployment writer
+        rng = random.Random(17)
+        at, events = datetime(2026, 3, 2), []
+        for i in range(120):
+            at += timedelta(minutes=rng.randint(5, 90))
+            status = DeploymentStatus.FAILED if rng.random() < 0.4 else DeploymentStatus.SUCCESS
+            events.append(DeploymentEvent(project.id, owner.id, rng.choice(["prod", "staging"]), f"v{i}", status, at))
+        for i in range(0, len(events), 16):
+            async with async_session() as db:
+                await deployment_writer.write(db, events[i:i + 16])
+                await db.commit()
+
+        async with async_session() as db:
+            rows = (await db.execute(select(Deployment))).scalars().all()
+
+        # Partial days at both edges and whole days from the rollups in between
+        windows = [
+            (datetime(2026, 3, 2, 9, 30), datetime(2026, 3, 4, 17, 15)),
+            (datetime(2026, 3, 3), datetime(2026, 3, 5)),
+            (datetime(2026, 3, 3, 1), datetime(2026, 3, 3, 23)),
+        ]
+        async with client() as http:
+            for start, end in windows:
+                response = await http.get(f"/projects/{project.id}/dora", headers=auth(owner), params={
+                    "start": start.isoformat(), "end": end.isoformat(),
+                })
+                assert response.status_code == 200
+                assert response.json()["environments"] == raw_scan(rows, start, end), (start, end)
+                assert response.json()["overall"]["restores"] > 0
+
+            async with async_session() as db:
+                await rebuild_dora_rollups(db, [project.id])
+                await db.commit()
+            start, end = windows[0]
+            response = await http.get(f"/projects/{project.id}/dora", headers=auth(owner), params={
+                "start": start.isoformat(), "end": end.isoformat(),
+            })
+            assert response.json()["environments"] == raw_scan(rows, start, end)
+
+    run(scenario())
@@ -0,0 +1,90 @@
+import gzip
+import json
+from datetime import datetime
+from sqlalchemy import delete
+from sqlalchemy.future import select
+from app.db.database import async_session
+from app.models.activity import TaskActivity
+from app.models.project_feedback import ProjectFeedback
+from app.models.task import Task, TaskStatus
+from app.services.importer import ACTIVITY_COLUMNS, TASK_COLUMNS
+from tests.conftest import auth, client, create_project, create_user
+
+
+async def seed_project():
+    async with async_session() as db:
+        owner = await create_user(db, "owner", role="admin")
+        project, tasks = await create_project(db, owner, tasks=3)
+        tasks[1].status = TaskStatus.DONE
+        tasks[2].assignee_id = owner.id
+        now = datetime.utcnow().replace(microsecond=0)
+        db.add_all([
+            TaskActivity(task_id=task.id, user_id=owner.id, action=action, details=f"{action} {task.id}", created_at=now)
+            for task in tasks for action in ("created", "updated")
+        ])
+        db.add(ProjectFeedback(project_id=project.id, user_id=owner.id, feedback_type="note", content="Looks good"))
+        await db.commit()
+    return owner, project
+
+
+async def table_rows(model, columns) -> list:
+    async with async_session() as db:
+        result = await db.execute(select(model.id, *(model.__table__.c[name] for name in columns)).order_by(model.id))
+        return [tuple(row) for row in result]
+
+
+def parse_ndjson(body: bytes) -> list:
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def test_gzip_export_decodes_to_ndjson_records(run):
+    async def scenario():
+        owner, project = await seed_project()
+        async with client() as http:
+            response = await http.get(f"/projects/{project.id}/export", headers=auth(owner), params={"gzip": "true"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert f'filename="project-{project.id}-export.ndjson.gz"' in response.headers["content-disposition"]
+
+        records = parse_ndjson(gzip.decompress(response.content))
+        assert all(set(record) == {"type", "data"} for record in records)
+        assert [record["type"] for record in records] == ["task"] * 3 + ["task_activity"] * 6 + ["project_feedback"]
+        tasks = [record["data"] for record in records if record["type"] == "task"]
+        assert [task["status"] for task in tasks] == ["todo", "done", "todo"]
+        assert [(task["id"], task["project_id"]) for task in tasks] == [
+            (task_id, project.id) for task_id, *_ in await table_rows(Task, ())
+        ]
+        assert records[-1]["data"]["content"] == "Looks good"
+
+    run(scenario())
+
+
+def test_export_round_trips_through_the_importer(run):
+    async def scenario():
+        owner, project = await seed_project()
+        tasks = await table_rows(Task, TASK_COLUMNS)
+        activities = await table_rows(TaskActivity, ACTIVITY_COLUMNS)
+
+        async with client() as http:
+            export = await http.get(f"/projects/{project.id}/export", headers=auth(owner))
+            assert export.status_code == 200
+
+            async with async_session() as db:
+                await db.execute(delete(TaskActivity))
+                await db.execute(delete(Task))
+                await db.commit()
+
+            response = await http.post(
+                "/admin/import/tasks", headers=auth(owner),
+                files={"file": ("export.ndjson", export.content, "application/x-ndjson")},
+            )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == {"tasks": 3, "task_activities": 6}
+        # Feedback is exported but not importable
+        assert report["errors"] == [{"line": 10, "error": "Unknown record type"}]
+
+        assert await table_rows(Task, TASK_COLUMNS) == tasks
+        assert await table_rows(TaskActivity, ACTIVITY_COLUMNS) == activities
+
+    run(scenario())
@@ -0,0 +1,92 @@
+import io
+import json
+from sqlalchemy import func
+from sqlalchemy.future import select
+from app.db.database import async_session
+from app.models.activity import TaskActivity
+from app.models.task import Task
+from app.services.importer import parse_records, read_csv, read_ndjson
+from tests.conftest import auth, client, create_project, create_user
+
+
+def ndjson(*records) -> str:
+    return "".join((record if isinstance(record, str) else json.dumps(record)) + "\n" for record in records)
+
+
+def test_parse_records_rejects_invalid_rows():
+    source = io.StringIO(ndjson(
+        {"type": "task", "data": {"title": "ok", "project_id": 1, "creator_id": 1, "status": "done"}},
+        {"type": "task", "data": {"project_id": 1, "creator_id": 1}},
+        {"type": "task", "data": {"title": "x", "project_id": 1, "creator_id": 1, "status": "finished"}},
+        {"type": "task", "data": {"title": "x", "project_id": "one", "creator_id": 1}},
+        {"type": "task_activity", "data": {"task_id": 1, "user_id": 1, "action": "a", "created_at": "yesterday"}},
+        {"type": "project", "data": {"name": "x"}},
+        "{not json",
+    ))
+    chunks = list(parse_records(read_ndjson(source), chunk_size=3))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+    rows = [row for chunk in chunks for row in chunk]
+    assert rows[0][1] == "tasks" and rows[0][3][:3] == ("ok", None, "DONE")
+    assert [(line_no, error) for line_no, table, _, error in rows if table is None] == [
+        (2, "title is required"),
+        (3, "status must be one of todo, in_progress, done"),
+        (4, "project_id must be an integer"),
+        (5, "created_at must be an ISO 8601 timestamp"),
+        (6, "Unknown record type"),
+        (7, rows[6][3]),
+    ]
+    assert rows[6][3].startswith("Invalid JSON")
+
+
+def test_csv_empty_cells_are_null():
+    source = io.StringIO("title,description,project_id,creator_id\nFirst,,1,2\n")
+    [[(line_no, table, record_id, values)]] = parse_records(read_csv(source, "tasks"))
+    assert (line_no, table, record_id) == (2, "tasks", None)
+    assert values[:5] == ("First", None, "TODO", 1, 2)
+
+
+def test_import_reports_rejects_and_throughput(run):
+    async def scenario():
+        async with async_session() as db:
+            admin = await create_user(db, "admin", role="admin")
+            project, [existing] = await create_project(db, admin, tasks=1)
+            await db.commit()
+
+        upload = ndjson(
+            {"type": "task", "data": {"id": 100, "title": "Imported", "project_id": project.id, "creator_id": admin.id}},
+            {"type": "task_activity", "data": {"task_id": 100, "user_id": admin.id, "action": "created",
+                                               "created_at": "2024-01-15T10:00:00+00:00"}},
+            {"type": "task", "data": {"title": "No project", "project_id": 999, "creator_id": admin.id}},
+            {"type": "task", "data": {"title": "No creator", "project_id": project.id, "creator_id": 999}},
+            {"type": "task", "data": {"id": existing.id, "title": "Taken", "project_id": project.id, "creator_id": admin.id}},
+            {"type": "task", "data": {"title": "Bad status", "project_id": project.id, "creator_id": admin.id, "status": "?"}},
+        )
+        async with client() as http:
+            response = await http.post(
+                "/admin/import/tasks", headers=auth(admin),
+                files={"file": ("tasks.ndjson", upload.encode(), "application/x-ndjson")},
+            )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == {"tasks": 1, "task_activities": 1}
+        assert report["rejected"] == 4
+        assert sorted(report["errors"], key=lambda error: error["line"]) == [
+            {"line": 3, "error": "project 999 not found"},
+            {"line": 4, "error": "creator 999 not found"},
+            {"line": 5, "error": f"id {existing.id} already exists"},
+            {"line": 6, "error": "status must be one of todo, in_progress, done"},
+        ]
+        assert report["seconds"] >= 0
+        assert report["rows_per_second"] > 0
+
+        async with async_session() as db:
+            assert (await db.execute(select(func.count()).select_from(Task))).scalar() == 2
+            assert (await db.execute(select(TaskActivity.task_id))).scalars().all() == [100]
+            # The sequence moved past the explicit id
+            task = Task(title="After", project_id=project.id, creator_id=admin.id)
+            db.add(task)
+            await db.flush()
+            assert task.id > 100
+
+    run(scenario())
@@ -0,0 +1,84 @@
+import logging
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from app.db.database import async_session, engine
+from app.db.instrumentation import instrumentation
+from tests.conftest import auth, client, create_project, create_user
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    monkeypatch.setattr(instrumentation, "enabled", True)
+    monkeypatch.setattr(instrumentation, "requests", 0)
+    monkeypatch.setattr(instrumentation, "statements", 0)
+    monkeypatch.setattr(instrumentation, "repeat_warnings", 0)
+    return instrumentation
+
+
+async def owner_and_project():
+    async with async_session() as db:
+        owner = await create_user(db, "owner")
+        project, _ = await create_project(db, owner, tasks=2)
+        await db.commit()
+    return owner, project
+
+
+def test_statement_count_header(run, instrumented):
+    async def scenario():
+        owner, project = await owner_and_project()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with client() as http:
+                response = await http.get(f"/projects/{project.id}/stats", headers=auth(owner))
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert int(response.headers["X-DB-Statements"]) == len(statements) > 0
+        assert response.headers["X-DB-Commits"] == "0"
+        assert float(response.headers["X-DB-Time-Ms"]) > 0
+        assert instrumented.requests == 1
+
+    run(scenario())
+
+
+def test_repeated_statement_warns(run, instrumented, monkeypatch, caplog):
+    async def scenario():
+        owner, project = await owner_and_project()
+        # Both partial edge days of this window are scanned with the same statement
+        params = {"start": datetime(2026, 3, 2, 12).isoformat(), "end": datetime(2026, 3, 4, 12).isoformat()}
+        async with client() as http:
+            monkeypatch.setattr(instrumentation, "repeat_threshold", 2)
+            response = await http.get(f"/projects/{project.id}/dora", headers=auth(owner), params=params)
+            assert response.status_code == 200
+            assert instrumented.repeat_warnings == 0
+
+            monkeypatch.setattr(instrumentation, "repeat_threshold", 1)
+            with caplog.at_level(logging.WARNING, logger="app.db.instrumentation"):
+                response = await http.get(f"/projects/{project.id}/dora", headers=auth(owner), params=params)
+            assert response.status_code == 200
+            assert instrumented.repeat_warnings == 1
+            assert "Possible N+1: GET /projects/" in caplog.text
+
+    run(scenario())
+
+
+def test_streamed_response_is_counted_after_the_body(run, instrumented):
+    async def scenario():
+        owner, project = await owner_and_project()
+        async with client() as http:
+            response = await http.get(f"/projects/{project.id}/export", headers=auth(owner))
+        assert response.status_code == 200
+        assert response.text.count('"type": "task"') == 2
+        assert "X-DB-Statements" not in response.headers
+        # The export's own queries ran after the headers and are in the totals
+        assert instrumented.requests == 1
+        assert instrumented.statements >= 4 + 2
+
+    run(scenario())
@@ -0,0 +1,50 @@
+import pytest
+from app.db.database import async_session
+from app.services.membership_cache import membership_cache
+from tests.conftest import auth, client, create_project, create_user
+
+
+async def private_project():
+    async with async_session() as db:
+        owner = await create_user(db, "owner")
+        project, _ = await create_project(db, owner)
+        project.is_public = False
+        members = {role: await create_user(db, role, role=role) for role in ("student", "supervisor")}
+        await db.commit()
+    return owner, project, members
+
+
+@pytest.mark.parametrize("role", ["student", "supervisor"])
+def test_removed_member_is_refused_on_the_next_request(run, role):
+    async def scenario():
+        owner, project, members = await private_project()
+        member = members[role]
+        async with client() as http:
+            response = await http.post(f"/projects/{project.id}/{role}s", headers=auth(owner), json={"user_id": member.id})
+            assert response.status_code == 200
+            # Loads and caches the membership
+            assert (await http.get(f"/projects/{project.id}", headers=auth(member))).status_code == 200
+            assert (await http.get(f"/projects/{project.id}", headers=auth(member))).status_code == 200
+            assert membership_cache.hits >= 1
+
+            response = await http.delete(f"/projects/{project.id}/{role}s/{member.id}", headers=auth(owner))
+            assert response.status_code == 200
+            assert (await http.get(f"/projects/{project.id}", headers=auth(member))).status_code == 403
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("role", ["student", "supervisor"])
+def test_bulk_add_evicts_a_cached_refusal(run, role):
+    async def scenario():
+        owner, project, members = await private_project()
+        member = members[role]
+        async with client() as http:
+            # Caches an empty membership set
+            assert (await http.get(f"/projects/{project.id}", headers=auth(member))).status_code == 403
+
+            response = await http.post(f"/projects/{project.id}/{role}s/bulk", headers=auth(owner), json={"user_ids": [member.id]})
+            assert response.json()["added"] == [member.id]
+            assert (await http.get(f"/projects/{project.id}", headers=auth(member))).status_code == 200
+
+    run(scenario())
@@ -0,0 +1,75 @@
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.database import async_session
+from app.models.activity import TaskActivity
+from app.models.project_feedback import ProjectFeedback
+from app.models.task import Task
+from app.schemas.project import FeedbackResponse
+from app.schemas.task import TaskActivityResponse
+from tests.conftest import auth, client, create_project, create_user
+
+ACTIVITY_KEY = (TaskActivity.created_at, TaskActivity.id)
+
+
+def test_cursor_round_trip():
+    values = (datetime(2024, 1, 1, 12, 30), 42)
+    assert decode_cursor(encode_cursor(values), ACTIVITY_KEY) == values
+
+
+@pytest.mark.parametrize("values", [
+    ["2024-01-01T00:00:00", "x"],
+    ["2024-01-01T00:00:00", 1.5],
+    ["2024-01-01T00:00:00", True],
+    ["2024-01-01T00:00:00", None],
+    ["2024-01-01T00:00:00", 2 ** 40],
+    ["2024-01-01T00:00:00+00:00", 1],
+    [20240101, 1],
+    ["yesterday", 1],
+    ["2024-01-01T00:00:00"],
+])
+def test_malformed_cursor_is_a_bad_request(values):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(encode_cursor(values), ACTIVITY_KEY)
+    assert error.value.status_code == 400
+
+
+def test_garbage_cursor_is_a_bad_request():
+    with pytest.raises(HTTPException) as error:
+        decode_cursor("not a cursor!", (Task.id,))
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("kind", ["activities", "feedback"])
+def test_list_endpoints_return_pages(run, kind):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            project, [task] = await create_project(db, owner, tasks=1)
+            # Within this month's activity partition
+            start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+            for i in range(5):
+                db.add(TaskActivity(task_id=task.id, user_id=owner.id, action="updated", created_at=start.replace(minute=i)))
+                db.add(ProjectFeedback(project_id=project.id, user_id=owner.id, feedback_type="note", content=f"Note {i}"))
+            await db.commit()
+
+        url, schema = {
+            "activities": (f"/tasks/{task.id}/activities", TaskActivityResponse),
+            "feedback": (f"/projects/{project.id}/feedback", FeedbackResponse),
+        }[kind]
+        pages, params = [], {"limit": 2}
+        async with client() as http:
+            while True:
+                response = await http.get(url, headers=auth(owner), params=params)
+                assert response.status_code == 200
+                page = response.json()
+                assert set(page) == {"items", "next_cursor"}
+                assert all(set(item) == set(schema.model_fields) for item in page["items"])
+                pages.append([item["id"] for item in page["items"]])
+                if page["next_cursor"] is None:
+                    break
+                params["cursor"] = page["next_cursor"]
+        assert pages == [[5, 4], [3, 2], [1]]
+
+    run(scenario())
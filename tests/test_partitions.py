@@ -0,0 +1,42 @@
+import gzip
+import os
+from datetime import date, datetime
+from sqlalchemy import insert
+from app.db.database import async_session, engine
+from app.models.activity import TaskActivity
+from app.models.project import Project
+from app.models.task import Task
+from app.services.partitions import archive_old_partitions, ensure_month_partitions, list_partitions
+from tests.conftest import create_user
+
+
+def test_archive_copies_detaches_and_drops_old_partitions(run, tmp_path):
+    async def scenario():
+        async with async_session() as db:
+            user = await create_user(db, "owner")
+            project = Project(name="project", owner_id=user.id)
+            db.add(project)
+            await db.flush()
+            task = Task(title="Task", project_id=project.id, creator_id=user.id)
+            db.add(task)
+            await db.flush()
+            await ensure_month_partitions(db, [date(2020, 1, 1), date(2020, 2, 1)])
+            await db.execute(insert(TaskActivity), [
+                {"task_id": task.id, "user_id": user.id, "action": "updated", "created_at": datetime(2020, 1, 15)},
+                {"task_id": task.id, "user_id": user.id, "action": "updated", "created_at": datetime(2020, 2, 15)},
+            ])
+            await db.commit()
+
+        archived = await archive_old_partitions(engine, 1, str(tmp_path), today=date(2020, 3, 10))
+
+        assert archived == [str(tmp_path / "task_activities_y2020m01.csv.gz")]
+        with gzip.open(archived[0], "rt") as archive:
+            lines = archive.read().splitlines()
+        assert len(lines) == 2 and lines[0].startswith("id,task_id")
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+        async with async_session() as db:
+            months = await list_partitions(db)
+        assert date(2020, 1, 1) not in months and date(2020, 2, 1) in months
+
+    run(scenario())
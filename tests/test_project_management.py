@@ -0,0 +1,70 @@
+from sqlalchemy import func
+from sqlalchemy.future import select
+from app.db.database import async_session
+from app.models.project_students import project_students
+from app.models.project_supervisors import project_supervisors
+from tests.conftest import auth, client, create_project, create_user
+
+
+async def project_with_users():
+    async with async_session() as db:
+        owner = await create_user(db, "owner")
+        project, _ = await create_project(db, owner)
+        students = [await create_user(db, f"student{i}", role="student") for i in range(3)]
+        supervisor = await create_user(db, "supervisor", role="supervisor")
+        await db.commit()
+    return owner, project, students, supervisor
+
+
+async def member_count(table) -> int:
+    async with async_session() as db:
+        return (await db.execute(select(func.count()).select_from(table))).scalar()
+
+
+def test_bulk_add_is_idempotent(run):
+    async def scenario():
+        owner, project, students, supervisor = await project_with_users()
+        s0, s1, s2 = (student.id for student in students)
+        url = f"/projects/{project.id}/students/bulk"
+        async with client() as http:
+            response = await http.post(url, headers=auth(owner), json={"user_ids": [s0, s1, s0, 999, supervisor.id]})
+            assert response.status_code == 200
+            assert response.json() == {
+                "added": [s0, s1],
+                "already_members": [],
+                "errors": [
+                    {"user_id": 999, "error": "User not found"},
+                    {"user_id": supervisor.id, "error": "User must have student role"},
+                ],
+            }
+
+            response = await http.post(url, headers=auth(owner), json={"user_ids": [s1, s2, s0]})
+            assert response.json() == {"added": [s2], "already_members": [s0, s1], "errors": []}
+            response = await http.post(f"/projects/{project.id}/students", headers=auth(owner), json={"user_id": s2})
+            assert response.status_code == 200
+        assert await member_count(project_students) == 3
+
+    run(scenario())
+
+
+def test_bulk_member_permissions(run):
+    async def scenario():
+        owner, project, students, supervisor = await project_with_users()
+        ids = [student.id for student in students]
+        async with client() as http:
+            response = await http.post(f"/projects/{project.id}/supervisors/bulk", headers=auth(owner), json={"user_ids": [supervisor.id]})
+            assert response.json()["added"] == [supervisor.id]
+
+            # Supervisors may enroll students but not other supervisors
+            response = await http.post(f"/projects/{project.id}/supervisors/bulk", headers=auth(supervisor), json={"user_ids": [supervisor.id]})
+            assert response.status_code == 403
+            response = await http.post(f"/projects/{project.id}/students/bulk", headers=auth(supervisor), json={"user_ids": ids})
+            assert response.json()["added"] == ids
+
+            # Students may do neither, and nothing is written
+            response = await http.post(f"/projects/{project.id}/students/bulk", headers=auth(students[0]), json={"user_ids": ids})
+            assert response.status_code == 403
+        assert await member_count(project_students) == 3
+        assert await member_count(project_supervisors) == 1
+
+    run(scenario())
@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.future import select
+from app.db.database import async_session, get_session
+from app.main import app
+from app.models.project import Project
+from tests.conftest import auth, client, create_user
+
+
+def stale_session(project_id: int):
+    """A get_session override whose session already holds the project as it was before a concurrent change"""
+    async def override():
+        async with async_session() as db:
+            # Keep a reference: the identity map only holds loaded objects weakly
+            project = (await db.execute(select(Project).where(Project.id == project_id))).scalar_one()
+            async with async_session() as other:
+                await other.execute(
+                    update(Project).where(Project.id == project_id)
+                    .values(description="changed elsewhere", version_id=Project.version_id + 1)
+                    .execution_options(synchronize_session=False)
+                )
+                await other.commit()
+            yield db
+            del project
+    return override
+
+
+@pytest.mark.parametrize("method", ["PUT", "DELETE"])
+def test_write_on_a_stale_project_is_a_conflict(run, method):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            project = Project(name="project", owner_id=owner.id)
+            db.add(project)
+            await db.commit()
+
+        app.dependency_overrides[get_session] = stale_session(project.id)
+        try:
+            async with client() as http:
+                response = await http.request(
+                    method, f"/projects/{project.id}", headers=auth(owner),
+                    json={"name": "renamed"} if method == "PUT" else None,
+                )
+        finally:
+            app.dependency_overrides.pop(get_session)
+
+        assert response.status_code == 409
+        async with async_session() as db:
+            current = (await db.execute(select(Project).where(Project.id == project.id))).scalar_one()
+        assert (current.name, current.version_id) == ("project", 2)
+
+    run(scenario())
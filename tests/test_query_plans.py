@@ -0,0 +1,185 @@
+"""
+Every hot query must be served by an index.
+
+A large dataset is seeded once for the module, then each query is EXPLAINed
+and fails if the plan falls back to a sequential scan on the table it reads.
+Set TEST_QUERY_PLAN_SCALE to seed a multiple of the default row counts.
+"""
+import json
+import os
+import pytest
+from sqlalchemy import text
+from app.db.database import engine
+from tests.conftest import reset_database, run_async
+
+SCALE = int(os.getenv("TEST_QUERY_PLAN_SCALE", "1"))
+
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (username, email, hashed_password, is_active, role)
+    SELECT 'plancheck_u' || g, 'plancheck_u' || g || '@example.com', 'x', true,
+           CASE WHEN g % 10 = 0 THEN 'supervisor' ELSE 'student' END
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO projects (name, description, owner_id, is_public)
+    SELECT 'plancheck_p' || g, NULL, :user_min + g % :users, g % 2 = 0
+    FROM generate_series(1, :projects) g
+    """,
+    """
+    INSERT INTO tasks (title, status, project_id, creator_id, assignee_id)
+    SELECT 'task ' || g, (ARRAY['TODO', 'IN_PROGRESS', 'DONE'])[1 + g % 3]::taskstatus,
+           :project_min + g % :projects, :user_min + g % :users, :user_min + (g * 7) % :users
+    FROM generate_series(1, :tasks) g
+    """,
+    """
+    INSERT INTO task_activities (task_id, user_id, action, details, created_at)
+    SELECT :task_min + g % :tasks, :user_min + g % :users, 'updated', NULL,
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, :activities) g
+    """,
+    """
+    INSERT INTO project_students (project_id, student_id)
+    SELECT :project_min + g % :projects, :user_min + (g / :projects) % :users
+    FROM generate_series(1, :memberships) g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO project_supervisors (project_id, supervisor_id)
+    SELECT :project_min + g % :projects, :user_min + (g / :projects) % :users
+    FROM generate_series(1, :memberships) g
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO ai_generations (project_id, user_id, generation_type, input_payload, status)
+    SELECT :project_min + g % :projects, :user_min + g % :users, 'cicd', '{}'::json, 'completed'
+    FROM generate_series(1, :history) g
+    """,
+    """
+    INSERT INTO deployments (project_id, deployed_by_id, environment, version, status, deployed_at)
+    SELECT :project_min + g % :projects, :user_min + g % :users,
+           (ARRAY['staging', 'production'])[1 + g % 2], 'v' || g, 'SUCCESS'::deploymentstatus,
+           now() - (g || ' seconds')::interval
+    FROM generate_series(1, :history) g
+    """,
+    """
+    INSERT INTO project_feedback (project_id, user_id, feedback_type, content)
+    SELECT :project_min + g % :projects, :user_min + g % :users, 'note', 'feedback ' || g
+    FROM generate_series(1, :history) g
+    """,
+]
+
+# (description, table that must not be sequentially scanned, query)
+HOT_QUERIES = [
+    ("activity feed for a task", "task_activities",
+     "SELECT * FROM task_activities WHERE task_id = :task_id ORDER BY created_at DESC LIMIT 50"),
+    ("tasks of a project by status", "tasks",
+     "SELECT * FROM tasks WHERE project_id = :project_id AND status = 'TODO'"),
+    ("project board page", "tasks",
+     "SELECT id, title, status, assignee_id, assignment_status, working_user_id FROM tasks "
+     "WHERE project_id = :project_id AND id > 0 ORDER BY id LIMIT 500"),
+    ("project board filtered by assignee", "tasks",
+     "SELECT id, title, status FROM tasks WHERE project_id = :project_id AND assignee_id = :user_id "
+     "ORDER BY id LIMIT 500"),
+    ("tasks assigned to a user", "tasks",
+     "SELECT * FROM tasks WHERE assignee_id = :user_id"),
+    ("student membership check", "project_students",
+     "SELECT 1 FROM project_students WHERE project_id = :project_id AND student_id = :user_id"),
+    ("supervisor membership check", "project_supervisors",
+     "SELECT 1 FROM project_supervisors WHERE project_id = :project_id AND supervisor_id = :user_id"),
+    ("projects of a student", "project_students",
+     "SELECT project_id FROM project_students WHERE student_id = :user_id"),
+    ("projects of a supervisor", "project_supervisors",
+     "SELECT project_id FROM project_supervisors WHERE supervisor_id = :user_id"),
+    ("projects of an owner", "projects",
+     "SELECT id FROM projects WHERE owner_id = :user_id"),
+    ("AI generations of a project", "ai_generations",
+     "SELECT * FROM ai_generations WHERE project_id = :project_id ORDER BY created_at DESC LIMIT 20"),
+    ("deployments of a project", "deployments",
+     "SELECT * FROM deployments WHERE project_id = :project_id ORDER BY deployed_at DESC LIMIT 20"),
+    ("latest deployment per environment", "deployments",
+     "SELECT DISTINCT ON (environment) environment, version, status, deployed_at FROM deployments "
+     "WHERE project_id = :project_id ORDER BY environment, deployed_at DESC"),
+    ("feedback of a project", "project_feedback",
+     "SELECT * FROM project_feedback WHERE project_id = :project_id ORDER BY created_at DESC LIMIT 50"),
+]
+
+
+def sequential_scans(plan: dict, table: str, empty: frozenset = frozenset()) -> list:
+    """Names of relations in the plan tree that belong to `table` and are sequentially scanned.
+
+    Relations in `empty` are skipped: scanning a partition with no rows,
+    such as a future month, is free and often the planner's best choice.
+    """
+    found = []
+    relation = plan.get("Relation Name", "")
+    if (plan.get("Node Type") == "Seq Scan" and relation not in empty
+            and (relation == table or relation.startswith(f"{table}_"))):
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found.extend(sequential_scans(child, table, empty))
+    return found
+
+
+async def seed(conn, scale: int) -> dict:
+    sizes = {
+        "users": 2000 * scale,
+        "projects": 500 * scale,
+        "tasks": 50000 * scale,
+        "activities": 200000 * scale,
+        "memberships": 20000 * scale,
+        "history": 20000 * scale,
+    }
+    params = dict(sizes)
+
+    await conn.execute(text(SEED_STATEMENTS[0]), params)
+    params["user_min"] = (await conn.execute(
+        text("SELECT min(id) FROM users WHERE username LIKE 'plancheck_u%'")
+    )).scalar_one()
+
+    await conn.execute(text(SEED_STATEMENTS[1]), params)
+    params["project_min"] = (await conn.execute(
+        text("SELECT min(id) FROM projects WHERE name LIKE 'plancheck_p%'")
+    )).scalar_one()
+
+    await conn.execute(text(SEED_STATEMENTS[2]), params)
+    params["task_min"] = (await conn.execute(
+        text("SELECT min(id) FROM tasks WHERE title LIKE 'task %' AND project_id >= :project_min"), params
+    )).scalar_one()
+
+    for statement in SEED_STATEMENTS[3:]:
+        await conn.execute(text(statement), params)
+
+    await conn.execute(text("ANALYZE"))
+    return params
+
+
+@pytest.fixture(scope="module")
+def seeded(migrated):
+    """Seed the dataset once; returns ids to plug into the queries and the relations left empty"""
+    async def main():
+        await reset_database()
+        async with engine.begin() as conn:
+            params = await seed(conn, SCALE)
+            empty = (await conn.execute(text(
+                "SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples = 0"
+            ))).scalars().all()
+        sample = {"project_id": params["project_min"], "user_id": params["user_min"], "task_id": params["task_min"]}
+        return sample, frozenset(empty)
+
+    return run_async(main())
+
+
+@pytest.mark.parametrize("description, table, query", HOT_QUERIES, ids=[entry[0] for entry in HOT_QUERIES])
+def test_hot_query_uses_an_index(seeded, description, table, query):
+    sample, empty = seeded
+
+    async def explain():
+        async with engine.connect() as conn:
+            return (await conn.execute(text(f"EXPLAIN (FORMAT JSON) {query}"), sample)).scalar_one()
+
+    plan = run_async(explain())
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    assert sequential_scans(plan[0]["Plan"], table, empty) == [], f"{description}: sequential scan on {table}"
@@ -0,0 +1,148 @@
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+from app.core import rate_limit
+from app.core.jwt import create_access_token
+from app.core.rate_limit import LocalBuckets, RateLimiter, RateLimitRule, client_ip
+from tests.conftest import ROOT
+
+LOGIN = RateLimitRule("login", "POST", re.compile(r"^/login$"), 2, 60, by_user=False)
+GENERATE = RateLimitRule(
+    "generate", "POST", re.compile(r"^/projects/\d+/generate$"), 5, 60,
+    max_in_flight=2, max_in_flight_per_client=1,
+)
+USERNAME = RateLimitRule("login-username", None, None, 1, 60)
+
+
+def limited_app(limiter: RateLimiter) -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(limiter)
+
+    @app.post("/login")
+    async def login():
+        return {}
+
+    @app.post("/projects/{project_id}/generate")
+    async def generate(project_id: int):
+        await asyncio.sleep(0.2)
+        return {}
+
+    return app
+
+
+def request(app: FastAPI, method: str, path: str, client=("10.0.0.1", 1234), **kwargs):
+    async def send():
+        transport = httpx.ASGITransport(app=app, client=client)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            return await http.request(method, path, **kwargs)
+    return send()
+
+
+def bearer(user_id: int) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+
+
+def test_empty_bucket_is_a_429_with_retry_after():
+    app = limited_app(RateLimiter((LOGIN,), LocalBuckets(100)))
+
+    async def scenario():
+        return [await request(app, "POST", "/login") for _ in range(3)]
+
+    responses = asyncio.run(scenario())
+    assert [response.status_code for response in responses] == [200, 200, 429]
+    assert responses[2].headers["Retry-After"] == "1"
+
+
+def test_in_flight_caps_per_user_and_per_route():
+    app = limited_app(RateLimiter((GENERATE,), LocalBuckets(100)))
+
+    async def scenario():
+        return await asyncio.gather(
+            request(app, "POST", "/projects/1/generate", headers=bearer(1)),
+            request(app, "POST", "/projects/1/generate", headers=bearer(1)),
+            request(app, "POST", "/projects/1/generate", headers=bearer(2)),
+            request(app, "POST", "/projects/1/generate", headers=bearer(3)),
+        )
+
+    assert [response.status_code for response in asyncio.run(scenario())] == [200, 429, 200, 429]
+
+
+def test_forwarded_for_is_only_trusted_from_configured_proxies(monkeypatch):
+    monkeypatch.setattr(rate_limit, "TRUSTED_PROXY_NETWORKS", [rate_limit.ip_network("10.0.0.0/8")])
+    limiter = RateLimiter((LOGIN,), LocalBuckets(100))
+    app = limited_app(limiter)
+
+    async def scenario():
+        statuses = []
+        for client in ("203.0.113.1", "203.0.113.2"):
+            for _ in range(2):
+                # The proxy appends the address it saw; the client may forge the rest
+                response = await request(
+                    app, "POST", "/login", headers={"X-Forwarded-For": f"1.2.3.4, {client}, 10.0.0.2"}
+                )
+                statuses.append(response.status_code)
+        # An untrusted peer cannot pick its own bucket
+        for _ in range(3):
+            response = await request(app, "POST", "/login", client=("198.51.100.7", 1234),
+                                     headers={"X-Forwarded-For": "203.0.113.9"})
+            statuses.append(response.status_code)
+        return statuses
+
+    assert asyncio.run(scenario()) == [200, 200, 200, 200, 200, 200, 429]
+
+
+def test_client_ip_without_trusted_proxies():
+    class Peer:
+        host = "10.0.0.2"
+
+    class FakeRequest:
+        client = Peer()
+        headers = {"X-Forwarded-For": "203.0.113.1"}
+
+    assert client_ip(FakeRequest()) == "10.0.0.2"
+
+
+def test_explicit_rule_raises_429():
+    limiter = RateLimiter((USERNAME,), LocalBuckets(100))
+
+    async def scenario():
+        await limiter.check("login-username", "alice")
+        await limiter.check("login-username", "bob")
+        with pytest.raises(HTTPException) as error:
+            await limiter.check("login-username", "alice")
+        return error.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 429 and error.headers["Retry-After"] == "1"
+    assert limiter.stats()["routes"]["login-username"]["limited"] == 1
+
+
+@pytest.mark.parametrize("setting", ["LOGIN_RATE_LIMIT_PER_MINUTE", "CICD_RATE_LIMIT_PER_MINUTE", "LOGIN_RATE_LIMIT_BURST"])
+def test_non_positive_budgets_are_rejected_at_startup(setting):
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.core.config"],
+        cwd=ROOT, env={**os.environ, setting: "0"}, capture_output=True, text=True,
+    )
+    assert result.returncode != 0 and setting in result.stderr
+
+
+def test_login_is_limited_per_username_across_addresses(run):
+    from app.main import app
+
+    async def scenario():
+        statuses = []
+        for attempt in range(rate_limit.LOGIN_USERNAME_RATE_LIMIT_BURST + 1):
+            response = await request(
+                app, "POST", "/login", client=(f"192.0.2.{attempt + 1}", 1234),
+                data={"username": "Victim", "password": "guess"},
+            )
+            statuses.append(response.status_code)
+        return statuses
+
+    statuses = run(scenario())
+    assert statuses == [401] * rate_limit.LOGIN_USERNAME_RATE_LIMIT_BURST + [429]
@@ -0,0 +1,29 @@
+from app.db.database import async_session
+from app.db.routing import recent_writers
+from tests.conftest import auth, client, create_user
+
+
+def test_only_committed_writes_pin_the_user_to_the_primary(run):
+    async def scenario():
+        recent_writers._local.clear()
+        async with async_session() as db:
+            user = await create_user(db, "owner")
+            await db.commit()
+        subject = str(user.id)
+
+        async with client() as http:
+            # Read-only POST
+            response = await http.post("/projects/access", headers=auth(user), json={"project_ids": [1]})
+            assert response.status_code == 200
+            assert not await recent_writers.contains(subject)
+
+            # Failed write
+            response = await http.put("/projects/999", headers=auth(user), json={"name": "x"})
+            assert response.status_code == 404
+            assert not await recent_writers.contains(subject)
+
+            response = await http.post("/projects", headers=auth(user), json={"name": "project"})
+            assert response.status_code == 200
+            assert await recent_writers.contains(subject)
+
+    run(scenario())
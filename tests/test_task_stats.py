@@ -0,0 +1,59 @@
+from app.db.database import async_session
+from app.services.task_stats import rebuild_task_stats
+from tests.conftest import auth, client, create_project, create_user
+
+
+def test_incremental_stats_match_a_rebuild(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            alice = await create_user(db, "alice")
+            bob = await create_user(db, "bob")
+            project, _ = await create_project(db, owner)
+            await db.commit()
+
+        async with client() as http:
+            async def post(path, user=owner, **body):
+                response = await http.post(path, headers=auth(user), json=body or None)
+                assert response.status_code == 200, response.text
+                return response.json()
+
+            created = [
+                (await post("/tasks", title=f"Task {i}", project_id=project.id, assignee_id=assignee))["id"]
+                for i, assignee in enumerate([alice.id, alice.id, bob.id, None])
+            ]
+            bulk = await post("/tasks/bulk", project_id=project.id, tasks=[
+                {"title": "Bulk 1", "assignee_id": bob.id}, {"title": "Bulk 2"}, {"title": ""},
+            ])
+            created += [entry["id"] for entry in bulk["created"]]
+
+            await post(f"/tasks/{created[0]}/accept", alice)
+            await post(f"/tasks/{created[0]}/start", alice)
+            await post(f"/tasks/{created[1]}/reject", alice)
+            await post(f"/tasks/{created[4]}/accept", bob)
+
+            response = await http.put(f"/tasks/{created[2]}", headers=auth(owner), json={"status": "done", "assignee_id": alice.id})
+            assert response.status_code == 200
+            response = await http.patch("/tasks/bulk", headers=auth(owner), json={"project_id": project.id, "tasks": [
+                {"id": created[3], "status": "in_progress", "assignee_id": bob.id},
+                {"id": created[4], "status": "done"},
+                {"id": created[5], "title": "Renamed"},
+                {"id": 999, "status": "done"},
+            ]})
+            assert len(response.json()["updated"]) == 3
+            assert (await http.delete(f"/tasks/{created[0]}", headers=auth(owner))).status_code == 200
+            assert (await http.delete(f"/tasks/{created[5]}", headers=auth(owner))).status_code == 200
+
+            incremental = (await http.get(f"/projects/{project.id}/stats", headers=auth(owner))).json()
+            async with async_session() as db:
+                await rebuild_task_stats(db, [project.id])
+                await db.commit()
+            rebuilt = (await http.get(f"/projects/{project.id}/stats", headers=auth(owner))).json()
+
+        for stats in (incremental, rebuilt):
+            stats.pop("updated_at")
+        assert incremental == rebuilt
+        assert rebuilt["total"] == 4
+        assert rebuilt["by_status"] == {"todo": 1, "in_progress": 1, "done": 2}
+
+    run(scenario())
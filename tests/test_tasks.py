@@ -0,0 +1,269 @@
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.future import select
+from app.db.database import async_session, engine, get_session
+from app.main import app
+from app.models.task import Task, TaskStatus, AssignmentStatus
+from app.routes import tasks as task_routes
+from tests.conftest import auth, client, create_project, create_user
+
+
+async def bump_versions(*task_ids):
+    """Commit a change to these tasks from another session, as a concurrent writer would"""
+    async with async_session() as other:
+        await other.execute(
+            update(Task).where(Task.id.in_(task_ids))
+            .values(description="changed elsewhere", version_id=Task.version_id + 1)
+            .execution_options(synchronize_session=False)
+        )
+        await other.commit()
+
+
+def test_bulk_update_is_a_single_update_statement(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            project, created = await create_project(db, owner, tasks=5)
+            await db.commit()
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with client() as http:
+                response = await http.patch("/tasks/bulk", headers=auth(owner), json={
+                    "project_id": project.id,
+                    "tasks": [{"id": task.id, "status": "done", "title": f"Renamed {task.id}"} for task in created],
+                })
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert response.json()["errors"] == []
+        assert [entry["index"] for entry in response.json()["updated"]] == [0, 1, 2, 3, 4]
+        assert len([statement for statement in statements if statement.lstrip().startswith("UPDATE tasks")]) == 1
+
+        async with async_session() as db:
+            rows = (await db.execute(select(Task).order_by(Task.id))).scalars().all()
+        assert {(task.status, task.version_id) for task in rows} == {(TaskStatus.DONE, 2)}
+        assert [task.title for task in rows] == [f"Renamed {task.id}" for task in created]
+        assert {task.description for task in rows} == {None}
+
+    run(scenario())
+
+
+def test_bulk_update_reports_tasks_changed_concurrently(run, monkeypatch):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            project, created = await create_project(db, owner, tasks=3)
+            await db.commit()
+        stale = created[1].id
+
+        existing_user_ids = task_routes.existing_user_ids
+
+        async def race(db, user_ids):
+            # Runs after the handler has read the tasks' versions
+            await bump_versions(stale)
+            return await existing_user_ids(db, user_ids)
+
+        monkeypatch.setattr(task_routes, "existing_user_ids", race)
+        async with client() as http:
+            response = await http.patch("/tasks/bulk", headers=auth(owner), json={
+                "project_id": project.id,
+                "tasks": [{"id": task.id, "status": "done"} for task in created],
+            })
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [entry["id"] for entry in body["updated"]] == [created[0].id, created[2].id]
+        assert body["errors"] == [{"index": 1, "id": stale, "error": "Task was modified concurrently, retry"}]
+
+        async with async_session() as db:
+            rows = {task.id: task for task in (await db.execute(select(Task))).scalars().all()}
+        assert rows[stale].status == TaskStatus.TODO
+        assert rows[stale].description == "changed elsewhere"
+        assert rows[created[0].id].status == TaskStatus.DONE
+
+    run(scenario())
+
+
+def stale_session(task_id: int):
+    """A get_session override whose session already holds the task as it was before a concurrent change"""
+    async def override():
+        async with async_session() as db:
+            # Keep a reference: the identity map only holds loaded objects weakly
+            task = (await db.execute(select(Task).where(Task.id == task_id))).scalar_one()
+            await db.refresh(task, ["project"])
+            await bump_versions(task_id)
+            yield db
+            del task
+    return override
+
+
+@pytest.mark.parametrize("method, path, assignment_status", [
+    ("POST", "/tasks/{id}/accept", AssignmentStatus.PENDING),
+    ("POST", "/tasks/{id}/reject", AssignmentStatus.PENDING),
+    ("POST", "/tasks/{id}/start", AssignmentStatus.ACCEPTED),
+    ("DELETE", "/tasks/{id}", AssignmentStatus.PENDING),
+    ("PUT", "/tasks/{id}", AssignmentStatus.PENDING),
+])
+def test_write_on_a_stale_task_is_a_conflict(run, method, path, assignment_status):
+    async def scenario():
+        async with async_session() as db:
+            user = await create_user(db, "owner")
+            _, (task,) = await create_project(db, user, tasks=1, assignee_id=user.id, assignment_status=assignment_status)
+            await db.commit()
+
+        app.dependency_overrides[get_session] = stale_session(task.id)
+        try:
+            async with client() as http:
+                response = await http.request(
+                    method, path.format(id=task.id), headers=auth(user),
+                    json={"status": "done"} if method == "PUT" else None,
+                )
+        finally:
+            app.dependency_overrides.pop(get_session)
+
+        assert response.status_code == 409
+        async with async_session() as db:
+            current = (await db.execute(select(Task).where(Task.id == task.id))).scalar_one()
+        assert (current.version_id, current.status, current.assignment_status) == (2, TaskStatus.TODO, assignment_status)
+
+    run(scenario())
+
+
+def test_stale_if_match_is_a_failed_precondition(run):
+    async def scenario():
+        async with async_session() as db:
+            user = await create_user(db, "owner")
+            _, (task,) = await create_project(db, user, tasks=1)
+            await db.commit()
+
+        app.dependency_overrides[get_session] = stale_session(task.id)
+        try:
+            async with client() as http:
+                response = await http.delete(
+                    f"/tasks/{task.id}", headers={**auth(user), "If-Match": f'"task-{task.id}-1-1"'}
+                )
+        finally:
+            app.dependency_overrides.pop(get_session)
+
+        assert response.status_code == 412
+
+    run(scenario())
+
+
+def test_get_task_embeds_its_project(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            project, (task,) = await create_project(db, owner, tasks=1)
+            await db.commit()
+
+        async with client() as http:
+            response = await http.get(f"/tasks/{task.id}", headers=auth(owner))
+            assert response.status_code == 200
+            assert response.json()["project"] == {
+                "id": project.id, "name": project.name, "description": None,
+                "owner_id": owner.id, "is_public": True, "version_id": 1,
+            }
+
+            cached = await http.get(
+                f"/tasks/{task.id}", headers={**auth(owner), "If-None-Match": response.headers["ETag"]}
+            )
+            assert cached.status_code == 304
+
+            renamed = await http.put(f"/projects/{project.id}", headers=auth(owner), json={"name": "renamed"})
+            assert renamed.status_code == 200
+            refetched = await http.get(
+                f"/tasks/{task.id}", headers={**auth(owner), "If-None-Match": response.headers["ETag"]}
+            )
+            assert refetched.status_code == 200
+            assert refetched.json()["project"]["name"] == "renamed"
+
+    run(scenario())
+
+
+def test_delete_with_an_outdated_if_match_is_refused(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            _, (task,) = await create_project(db, owner, tasks=1)
+            await db.commit()
+        await bump_versions(task.id)
+
+        async with client() as http:
+            response = await http.delete(
+                f"/tasks/{task.id}", headers={**auth(owner), "If-Match": f'"task-{task.id}-1-1"'}
+            )
+            assert response.status_code == 412
+            current = await http.get(f"/tasks/{task.id}", headers=auth(owner))
+            assert current.status_code == 200
+            response = await http.delete(
+                f"/tasks/{task.id}", headers={**auth(owner), "If-Match": current.headers["ETag"]}
+            )
+            assert response.status_code == 200
+
+    run(scenario())
+
+
+def test_bulk_create_rejects_other_projects_and_invalid_items(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            other = await create_user(db, "other")
+            project, _ = await create_project(db, owner)
+            await db.commit()
+
+        async with client() as http:
+            body = {"project_id": project.id, "tasks": [{"title": "Valid"}, {"title": " "}, {"title": "Ghost", "assignee_id": 999}]}
+            response = await http.post("/tasks/bulk", headers=auth(other), json=body)
+            assert response.status_code == 403
+
+            response = await http.post("/tasks/bulk", headers=auth(owner), json=body)
+            assert response.status_code == 200
+            assert [entry["index"] for entry in response.json()["created"]] == [0]
+            assert response.json()["errors"] == [
+                {"index": 1, "error": "Title must not be empty"},
+                {"index": 2, "error": "User 999 not found"},
+            ]
+
+        async with async_session() as db:
+            assert (await db.execute(select(Task.title))).scalars().all() == ["Valid"]
+
+    run(scenario())
+
+
+def test_bulk_update_bumps_versions_only_of_changed_tasks_in_the_project(run):
+    async def scenario():
+        async with async_session() as db:
+            owner = await create_user(db, "owner")
+            other = await create_user(db, "other")
+            project, created = await create_project(db, owner, tasks=2)
+            _, [foreign] = await create_project(db, other, tasks=1)
+            await db.commit()
+
+        async with client() as http:
+            response = await http.patch("/tasks/bulk", headers=auth(owner), json={"project_id": project.id, "tasks": [
+                {"id": created[0].id, "status": "done"},
+                {"id": created[1].id},
+                {"id": foreign.id, "status": "done"},
+            ]})
+        assert response.status_code == 200
+        assert [entry["id"] for entry in response.json()["updated"]] == [created[0].id, created[1].id]
+        assert response.json()["errors"] == [{"index": 2, "id": foreign.id, "error": "Task not found in project"}]
+
+        async with async_session() as db:
+            rows = (await db.execute(select(Task.id, Task.status, Task.version_id))).all()
+        versions = {row.id: (row.status, row.version_id) for row in rows}
+        assert versions == {
+            created[0].id: (TaskStatus.DONE, 2),
+            created[1].id: (TaskStatus.TODO, 1),
+            foreign.id: (TaskStatus.TODO, 1),
+        }
+
+    run(scenario())
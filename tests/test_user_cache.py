@@ -0,0 +1,43 @@
+from sqlalchemy import update
+from app.core.dependencies import user_cache
+from app.db.database import async_session
+from app.models.user import User
+from tests.conftest import create_user
+
+
+def test_user_is_evicted_after_commit(run):
+    async def scenario():
+        async with async_session() as db:
+            user = await create_user(db, "member")
+            await db.commit()
+            key = str(user.id)
+
+            user_cache.set(key, "stale")
+            user.role = "admin"
+            await db.flush()
+            # A request between flush and commit still sees the old row
+            assert user_cache.get(key) == "stale"
+            await db.commit()
+            assert user_cache.get(key) is None
+
+            user_cache.set(key, "cached")
+            user.role = "user"
+            await db.flush()
+            await db.rollback()
+            assert user_cache.get(key) == "cached"
+
+    run(scenario())
+
+
+def test_bulk_user_update_clears_the_cache(run):
+    async def scenario():
+        async with async_session() as db:
+            user = await create_user(db, "member")
+            await db.commit()
+
+            user_cache.set(str(user.id), "stale")
+            await db.execute(update(User).where(User.id == user.id).values(role="admin"))
+            await db.commit()
+            assert user_cache.get(str(user.id)) is None
+
+    run(scenario())